@@ -0,0 +1,75 @@
+"""Vonesa e filtrave: maska booleane (`apply_filters`) kundrejt `FilterIndex`.
+
+Matet për disa madhësi tabele dhe kardinalitete të kolonës HS. Vetëm koha;
+ekuivalenca e të dyja rrugëve kontrollohet nga `tests/test_filters.py`.
+
+    python benchmarks/bench_filters.py [--rows 100000 1000000] [--hs 100 10000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from doganore.filters import FilterIndex, apply_filters  # noqa: E402
+
+KATEGORI = [f"Kategoria {i:02d}" for i in range(30)]
+
+
+def make_frame(n, n_hs, seed=0):
+    rng = np.random.default_rng(seed)
+    hs = rng.choice(np.arange(10_000_000, 99_999_999), n_hs, replace=False)
+    return pd.DataFrame({
+        "Viti": rng.integers(2015, 2026, n),
+        "Muaji": rng.integers(1, 13, n),
+        "Kodi HS": hs[rng.integers(0, n_hs, n)],
+        "Kategoria": pd.Categorical(rng.choice(KATEGORI, n)),
+        "Lloji": pd.Categorical(rng.choice(["Import", "Eksport"], n)),
+        "Vlera": rng.uniform(0, 1e6, n),
+    })
+
+
+def scenarios(df):
+    hs_vals = df["Kodi HS"].astype(str).unique()
+    base = dict(vit=2020, lloji="Import", kategoria=KATEGORI[:4], hs_col="Kodi HS")
+    return {
+        "vit+lloji+4 kat": dict(base, hs_pick=[]),
+        "+ 5 HS": dict(base, hs_pick=list(hs_vals[:5])),
+        "vetëm 1 HS": dict(hs_col="Kodi HS", hs_pick=[hs_vals[0]]),
+    }
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    ap.add_argument("--hs", type=int, nargs="+", default=[100, 10_000])
+    args = ap.parse_args(argv)
+
+    print(f"{'rreshta':>10} {'HS':>7}  {'skenari':<16} {'ndërtim':>9} {'maskë':>9} {'indeks':>9} {'shpejtim':>8}")
+    for n in args.rows:
+        for n_hs in args.hs:
+            df = make_frame(n, min(n_hs, n))
+            t0 = time.perf_counter()
+            index = FilterIndex(df, "Kodi HS")
+            t_build = time.perf_counter() - t0
+            for name, f in scenarios(df).items():
+                t_mask = best_of(lambda: apply_filters(df, **f))
+                t_idx = best_of(lambda: index.apply(df, **f))
+                print(f"{n:>10,} {n_hs:>7,}  {name:<16} {t_build * 1e3:>7.1f}ms "
+                      f"{t_mask * 1e3:>7.2f}ms {t_idx * 1e3:>7.2f}ms {t_mask / t_idx:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
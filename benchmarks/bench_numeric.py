@@ -0,0 +1,35 @@
+"""Krahason `coerce_number` (për qelizë) me `coerce_number_series` (kolonor).
+
+Vetëm koha; ekuivalenca e të dyjave kontrollohet nga `tests/test_numeric.py`.
+
+    python benchmarks/bench_numeric.py [--rows 1000000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from doganore.numeric import coerce_number, coerce_number_series  # noqa: E402
+from generate_data import dirty_column  # noqa: E402
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    args = ap.parse_args(argv)
+
+    ser = dirty_column(args.rows)
+    t_map = timed(lambda s: s.map(coerce_number), ser)
+    t_vec = timed(coerce_number_series, ser)
+    print(f"rreshta={args.rows:,}  map={t_map:.3f}s  kolonor={t_vec:.3f}s  shpejtim={t_map / t_vec:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Koha e çdo faze të tubacionit të faqes, mbi të dhëna sintetike ose një CSV.
+
+Fazat: leximi, aliaset, `coerce_number` (Vlera, Sasia), muajt, kodet HS,
+kolonat kategorike, kubi, indekset e filtrave dhe i HS-ve, filtrimi, çdo
+group-by i faqes, roll-up-et HS dhe ndërtimi i specifikimeve Altair. Për çdo fazë ruhet koha më e mirë nga
+`--repeat` përsëritje dhe rreshtat hyrës/dalës. Raporti JSON krahasohet me një
+raport të mëparshëm me `--compare`; kodi i daljes është 1 kur një fazë
+ngadalësohet përtej `--tolerance`.
+
+    python benchmarks/bench_pipeline.py --rows 1000000 --out raport.json
+    python benchmarks/bench_pipeline.py --rows 1000000 --compare raport.json
+    python benchmarks/bench_pipeline.py --csv te_dhena_doganore_simuluara.csv
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from doganore import engine  # noqa: E402
+from doganore.charts import monthly_series  # noqa: E402
+from doganore.cube import build_cube  # noqa: E402
+from doganore.filters import FilterIndex  # noqa: E402
+from doganore.hs_index import HSIndex  # noqa: E402
+from doganore.loader import read_csv_sniffed  # noqa: E402
+from doganore.normalize import (  # noqa: E402
+    CATEGORICAL_COLUMNS, apply_aliases, detect_hs_col, map_months, normalize_hs,
+)
+from doganore.numeric import coerce_number_series  # noqa: E402
+from generate_data import write_dataset  # noqa: E402
+
+# Nën këtë diferencë (sekonda) një ngadalësim konsiderohet zhurmë matjeje.
+NOISE_S = 0.002
+
+
+def _rows(out):
+    if isinstance(out, tuple):
+        out = out[0]
+    if isinstance(out, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(out)
+    return None
+
+
+class Stages:
+    """Mat fazat një nga një; rezultati i secilës i kalon fazës tjetër."""
+
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.report = {}
+
+    def run(self, name, fn, rows_in=None):
+        times = []
+        for _ in range(self.repeat):
+            t0 = time.perf_counter()
+            out = fn()
+            times.append(time.perf_counter() - t0)
+        self.report[name] = {"s": min(times), "rows_in": rows_in, "rows_out": _rows(out)}
+        return out
+
+
+def chart_specs(series, df_v, df_year):
+    """Specifikimet Vega-Lite të grafikëve kryesorë, me të dhënat të përfshira."""
+    return [
+        alt.Chart(series).mark_line(point=True).encode(x="Muaji:N", y="Vlera:Q", color="Kategoria:N").to_dict(),
+        alt.Chart(df_v).mark_bar().encode(x="Kategoria:N", y="Vlera:Q", xOffset="Viti:N").to_dict(),
+        alt.Chart(df_year).mark_bar().encode(x="Kategoria:N", y="Vlera:Q", xOffset="Lloji:N").to_dict(),
+    ]
+
+
+def run_pipeline(path, repeat):
+    st = Stages(repeat)
+    df_raw, _ = st.run("lexim", lambda: read_csv_sniffed(path))
+    n = len(df_raw)
+    df = st.run("aliaset", lambda: apply_aliases(df_raw), n)
+    df["Vlera"] = st.run("coerce_number[Vlera]", lambda: coerce_number_series(df["Vlera"]), n)
+    df["Sasia (kg)"] = st.run("coerce_number[Sasia]", lambda: coerce_number_series(df["Sasia (kg)"]), n)
+    df["Muaji"] = st.run("muajt", lambda: map_months(df["Muaji"]), n)
+    hs = detect_hs_col(df)
+    if hs:
+        df[hs] = st.run("kodet_hs", lambda: normalize_hs(df[hs]), n)
+    cats = st.run("kategorike", lambda: {c: df[c].astype("category") for c in CATEGORICAL_COLUMNS}, n)
+    df = df.assign(**cats)
+
+    cube = st.run("kubi", lambda: build_cube(df, hs), n)
+    row_index = st.run("indeksi[rreshta]", lambda: FilterIndex(df, hs), n)
+    cube_index = st.run("indeksi[kubi]", lambda: FilterIndex(cube, hs), len(cube))
+
+    filters = engine.default_filters(cube_index)
+    vit = filters["vit"]
+    st.run("filtri[rreshta]", lambda: row_index.rows(**filters), n)
+    cube_f = st.run("filtri[kubi]", lambda: cube_index.apply(cube, **filters), len(cube))
+
+    m = len(cube_f)
+    st.run("groupby[kpi]", lambda: engine.kpis(cube_f, vit), m)
+    series = st.run("groupby[mujore]", lambda: monthly_series(cube_f), m)
+    cube_kat = cube[cube["Kategoria"].isin(filters["kategoria"])]
+    df_v = st.run(
+        "groupby[vjetore]",
+        lambda: cube_kat[cube_kat["Lloji"] == filters["lloji"]]
+        .groupby(["Kategoria", "Viti"], as_index=False, observed=True)["Vlera"].sum(),
+        len(cube_kat),
+    )
+    df_year = st.run(
+        "groupby[import_vs_eksport]",
+        lambda: cube_kat[cube_kat["Viti"] == vit].groupby(["Kategoria", "Lloji"], as_index=False, observed=True)["Vlera"].sum(),
+        len(cube_kat),
+    )
+    if hs:
+        st.run("groupby[top_hs]", lambda: engine.top_hs(cube_f, hs), m)
+        hs_index = st.run("indeksi[hs]", lambda: HSIndex(cube, hs), len(cube))
+        pos = cube_f.index.to_numpy()
+        st.run("hs[top kodi]", lambda: hs_index.top(pos, "kodi"), m)
+        st.run("hs[top kapitulli]", lambda: hs_index.top(pos, "kapitulli"), m)
+        st.run("hs[kërkim]", lambda: hs_index.search("8"), len(hs_index))
+    st.run("grafik[spec]", lambda: chart_specs(series, df_v, df_year), len(series) + len(df_v) + len(df_year))
+    return n, st.report
+
+
+def _git_rev():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def meta(path, rows, args):
+    try:
+        import pyarrow
+    except ImportError:
+        pyarrow = None
+    return {
+        "koha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": _git_rev(),
+        "csv": str(path) if args.csv else None,
+        "bajte": Path(path).stat().st_size,
+        "rreshta": rows,
+        "dirty": None if args.csv else args.dirty,
+        "seed": None if args.csv else args.seed,
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "pyarrow": pyarrow.__version__ if pyarrow else None,
+        "platforma": platform.platform(),
+    }
+
+
+def print_report(report, baseline=None, tolerance=0.2):
+    """Shtyp tabelën; kthen fazat që janë ngadalësuar përtej tolerancës."""
+    slower = []
+    base = (baseline or {}).get("fazat", {})
+    print(f"{'faza':<28} {'koha':>10} {'rreshta':>12}" + (f" {'baza':>10} {'raporti':>8}" if base else ""))
+    for name, r in report.items():
+        rows = f"{r['rows_in']:,}" if r["rows_in"] is not None else ""
+        line = f"{name:<28} {r['s'] * 1e3:>8.1f}ms {rows:>12}"
+        if name in base:
+            b = base[name]["s"]
+            ratio = r["s"] / b if b else float("inf")
+            flag = ratio > 1 + tolerance and r["s"] - b > NOISE_S
+            line += f" {b * 1e3:>8.1f}ms {ratio:>7.2f}x" + ("  ⚠" if flag else "")
+            if flag:
+                slower.append(name)
+        print(line)
+    return slower
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--csv", help="CSV ekzistues; pa të, gjenerohet një dataset sintetik")
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--dirty", type=float, default=0.2)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", help="Ruaj raportin JSON këtu")
+    ap.add_argument("--compare", help="Raport JSON i mëparshëm për krahasim")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="Ngadalësimi i lejuar (0.2 = +20%%)")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv
+        if path is None:
+            path = Path(tmp) / "sintetike.csv"
+            t0 = time.perf_counter()
+            write_dataset(path, args.rows, dirty=args.dirty, seed=args.seed)
+            print(f"Gjeneruar {args.rows:,} rreshta në {time.perf_counter() - t0:.1f}s")
+        rows, report = run_pipeline(path, args.repeat)
+        result = {"meta": meta(path, rows, args), "fazat": report}
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if baseline["meta"].get("rreshta") != rows:
+            print(f"Kujdes: baza ka {baseline['meta'].get('rreshta'):,} rreshta, ky raport {rows:,}.")
+    slower = print_report(report, baseline, args.tolerance)
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    if slower:
+        print(f"Më ngadalë se baza (> {args.tolerance:.0%}): {', '.join(slower)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
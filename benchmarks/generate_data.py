@@ -0,0 +1,138 @@
+"""Gjeneron të dhëna doganore sintetike me skemën e `te_dhena_doganore_simuluara.csv`.
+
+Kolonat: Viti, Muaji, Kodi NK, Kategoria, Lloji, Sasia (kg), Vlera. Një pjesë e
+qelizave numerike shkruhen "të pista", si në eksportet reale: formati anglez
+(1,234.56) dhe ai europian (1.234,56), me "€", "Lek", "lekë" ose NBSP; disa muaj
+shkruhen me emër në vend të numrit. Skedari shkruhet me copa, ndaj 10^8 rreshta
+nuk kërkojnë më shumë memorie se një copë.
+
+    python benchmarks/generate_data.py out.csv --rows 1000000 [--dirty 0.2] [--hs 5000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from doganore.normalize import MUAJT_SHQIP_MAP  # noqa: E402
+
+COLUMNS = ["Viti", "Muaji", "Kodi NK", "Kategoria", "Lloji", "Sasia (kg)", "Vlera "]
+CHUNK_ROWS = 1_000_000
+POOL_SIZE = 50_000
+
+# Kategoritë e skedarit shembull; kodet HS shtesë ndajnë të njëjtat kategori.
+KATEGORI = [
+    "Drithera", "Lende djegese minerale", "Vaj baze ( lende e pare per prodhim vajra lubrifikant) SN-150",
+    "Pergatitje ushqimore(zevendesues djathi per fast food dhe pica)", "Boje plastike e bardhe",
+    "Makineri paketimi", "Mjete transporti rrugor", "Shtesat e pergatitura për çimento, llaçra apo betone",
+    "Fruta të thata", "Lule artificiale", "Çimento", "Produkte prej çimentoje, llaçi ose betoni",
+    "Album plastik fotografish", "Antiruxho",
+]
+
+
+def _formats():
+    eu = lambda x: f"{x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")  # noqa: E731
+    return [
+        lambda x: f"{x:,.2f}",
+        eu,
+        lambda x: f"€ {eu(x)}",
+        lambda x: f"{x:,.0f} Lek",
+        lambda x: f"{x:.0f}\xa0lekë",
+        lambda x: f"\xa0{x:,.2f}\xa0",
+    ]
+
+
+def dirty_pool(rng, size=POOL_SIZE, scale=1e5):
+    """Vargje numerike të pista; qelizat e pista zgjidhen nga ky grup, jo një nga një."""
+    values = rng.lognormal(np.log(scale), 1.0, size).round(2)
+    fmts = _formats()
+    kind = rng.integers(0, len(fmts), size)
+    return np.array([fmts[k](v) for k, v in zip(kind, values)], dtype=object)
+
+
+def dirty_column(n, seed=0, missing=0.01):
+    """Kolonë me `n` qeliza të pista nga `dirty_pool` dhe ~1% bosh (NaN).
+
+    I njëjti gjenerues për `bench_numeric.py` dhe `tests/test_numeric.py`.
+    """
+    rng = np.random.default_rng(seed)
+    out = dirty_pool(rng, size=n)
+    out[rng.random(n) < missing] = np.nan
+    return pd.Series(out)
+
+
+def hs_catalog(rng, n_hs):
+    """Kodet HS (4, 6 ose 8 shifra, kapitujt 01–97) si tekst, dhe kategoria e secilit."""
+    codes = {}
+    while len(codes) < n_hs:
+        m = n_hs - len(codes)
+        width = rng.choice([4, 6, 8], m)
+        rest = rng.integers(0, 10 ** (width - 2))
+        for w, ch, r in zip(width, rng.integers(1, 98, m), rest):
+            codes.setdefault(f"{ch:02d}{r:0{w - 2}d}", None)
+    return np.array(list(codes), dtype=object), rng.integers(0, len(KATEGORI), n_hs)
+
+
+def _measure(rng, n, scale, dirty, pool):
+    values = rng.lognormal(np.log(scale), 1.0, n).round().astype(np.int64)
+    if dirty <= 0:
+        return values
+    out = values.astype(object)
+    hit = np.flatnonzero(rng.random(n) < dirty)
+    out[hit] = pool[rng.integers(0, len(pool), len(hit))]
+    out[hit[rng.random(len(hit)) < 0.02]] = ""
+    return out
+
+
+def generate_chunk(rng, n, years, codes, cats, dirty, pools):
+    muaji = rng.integers(1, 13, n)
+    hs = rng.integers(0, len(codes), n)
+    months = muaji.astype(object)
+    if dirty > 0:
+        named = rng.random(n) < dirty / 4
+        months[named] = np.array(list(MUAJT_SHQIP_MAP.values()), dtype=object)[muaji[named] - 1]
+    return pd.DataFrame({
+        "Viti": rng.integers(years[0], years[1] + 1, n),
+        "Muaji": months,
+        "Kodi NK": codes[hs],
+        "Kategoria": pd.Categorical.from_codes(cats[hs], KATEGORI),
+        "Lloji": pd.Categorical.from_codes(rng.integers(0, 2, n), ["Import", "Eksport"]),
+        "Sasia (kg)": _measure(rng, n, 3e4, dirty, pools[0]),
+        "Vlera ": _measure(rng, n, 8e4, dirty, pools[1]),
+    }, columns=COLUMNS)
+
+
+def write_dataset(path, rows, dirty=0.2, n_hs=5_000, years=(2015, 2025), seed=0,
+                  encoding="cp1252", chunk_rows=CHUNK_ROWS):
+    """Shkruan `rows` rreshta në `path`; kthen numrin e bajteve të shkruara."""
+    rng = np.random.default_rng(seed)
+    codes, cats = hs_catalog(rng, n_hs)
+    pools = (dirty_pool(rng, scale=3e4), dirty_pool(rng, scale=8e4))
+    with open(path, "w", encoding=encoding, newline="") as fh:
+        for start in range(0, rows, chunk_rows):
+            part = generate_chunk(rng, min(chunk_rows, rows - start), years, codes, cats, dirty, pools)
+            part.to_csv(fh, index=False, header=start == 0)
+    return Path(path).stat().st_size
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("out")
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--dirty", type=float, default=0.2, help="Pjesa e qelizave numerike të pista (0–1)")
+    ap.add_argument("--hs", type=int, default=5_000, help="Numri i kodeve HS të dallueshme")
+    ap.add_argument("--years", type=int, nargs=2, default=[2015, 2025])
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--encoding", default="cp1252", help="cp1252 (si eksportet nga Windows) ose utf-8; latin1 nuk ka €")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    size = write_dataset(args.out, args.rows, args.dirty, args.hs, tuple(args.years), args.seed, args.encoding)
+    print(f"{args.rows:,} rreshta → {args.out} ({size / 1e6:,.1f} MB) në {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Logjika e përpunimit të të dhënave doganore, e ndarë nga faqja Streamlit."""
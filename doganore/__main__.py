@@ -0,0 +1,5 @@
+import sys
+
+from doganore.cli import main
+
+sys.exit(main())
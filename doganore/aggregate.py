@@ -0,0 +1,52 @@
+"""Tabela të paragreguara sipas (Viti, Muaji, Lloji, Kategoria, HS).
+
+Një tabelë e agreguar ka të njëjtat kolona si tabela e rreshtave, por çdo rresht
+përfaqëson `ROW_COUNT` rreshta origjinalë dhe "Vlera"/"Sasia (kg)" janë shuma.
+Kështu seksionet që mbledhin vlera punojnë njësoj mbi të dyja.
+"""
+import pandas as pd
+
+KEY_COLUMNS = ["Viti", "Muaji", "Lloji", "Kategoria"]
+MEASURE_COLUMNS = ["Vlera", "Sasia (kg)"]
+ROW_COUNT = "_rreshta"
+
+
+def group_keys(df, hs_col=None):
+    keys = [c for c in KEY_COLUMNS if c in df.columns]
+    if hs_col is not None and hs_col in df.columns and hs_col not in keys:
+        keys.append(hs_col)
+    return keys
+
+
+def aggregate_frame(df, hs_col=None):
+    """Mbledh rreshtat sipas çelësave; NaN në çelësa ruhen si grup më vete."""
+    keys = group_keys(df, hs_col)
+    measures = [c for c in MEASURE_COLUMNS if c in df.columns]
+    work = df[keys + measures].copy()
+    for c in measures:
+        work[c] = pd.to_numeric(work[c], errors="coerce").fillna(0)
+    work[ROW_COUNT] = 1
+    if not keys:
+        return work.sum().to_frame().T
+    return work.groupby(keys, dropna=False, observed=True, sort=False, as_index=False).sum()
+
+
+def merge_aggregates(parts):
+    """Bashkon tabela të agreguara (p.sh. nga copa të ndryshme të CSV-së)."""
+    parts = [p for p in parts if p is not None and not p.empty]
+    if not parts:
+        return pd.DataFrame()
+    if len(parts) == 1:
+        return parts[0]
+    merged = pd.concat(parts, ignore_index=True)
+    keys = [c for c in merged.columns if c not in MEASURE_COLUMNS and c != ROW_COUNT]
+    if not keys:
+        return merged.sum().to_frame().T
+    return merged.groupby(keys, dropna=False, observed=True, sort=False, as_index=False).sum()
+
+
+def row_count(frame):
+    """Numri i rreshtave origjinalë që përfaqëson `frame` (i agreguar ose jo)."""
+    if ROW_COUNT in frame.columns:
+        return int(frame[ROW_COUNT].sum())
+    return len(frame)
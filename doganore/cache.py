@@ -0,0 +1,102 @@
+"""Cache kolonor në disk (Feather/Arrow IPC) për tabelat e normalizuara.
+
+Çelësi është hash-i i përmbajtjes së CSV-së bashkë me `CACHE_VERSION`, ndaj
+çdo ndryshim i skedarit (ose i logjikës së normalizimit) jep një hyrje të re.
+Skedarët ruhen pa kompresim që të lexohen me memory-map në vend të parse-it.
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover
+    pa = feather = None
+
+# Rrite kur ndryshon normalize_frame, që cache-i i vjetër të mos përdoret më.
+CACHE_VERSION = 3
+# Me katalog çdo particion zë 1–2 hyrje, ndaj kufiri duhet të mbulojë disa vite muajsh.
+MAX_ENTRIES = int(os.environ.get("DOGANORE_CACHE_ENTRIES", 64))
+_BLOCK = 1 << 20
+
+
+def default_cache_dir():
+    return Path(os.environ.get("DOGANORE_CACHE_DIR", ".doganore_cache"))
+
+
+def source_digest(buf_or_path):
+    """Hash BLAKE2 i bajteve të burimit (shteg ose buffer si `UploadedFile`)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"v{CACHE_VERSION}".encode())
+    if hasattr(buf_or_path, "getvalue"):
+        h.update(buf_or_path.getvalue())
+    elif hasattr(buf_or_path, "read"):
+        pos = buf_or_path.tell()
+        for block in iter(lambda: buf_or_path.read(_BLOCK), b""):
+            h.update(block)
+        buf_or_path.seek(pos)
+    else:
+        with open(buf_or_path, "rb") as fh:
+            for block in iter(lambda: fh.read(_BLOCK), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+def source_stamp(buf_or_path):
+    """(madhësia, mtime) e skedarit – çelës i lirë për cache-in në proces."""
+    if hasattr(buf_or_path, "read"):
+        return None
+    st = os.stat(buf_or_path)
+    return st.st_size, st.st_mtime_ns
+
+
+def cache_path(digest, cache_dir=None):
+    return Path(cache_dir or default_cache_dir()) / f"{digest}.feather"
+
+
+def read_cached_frame(digest, cache_dir=None):
+    """Kthen tabelën nga cache-i (memory-mapped) ose None kur mungon/është e dëmtuar."""
+    if feather is None:
+        return None
+    path = cache_path(digest, cache_dir)
+    if not path.exists():
+        return None
+    try:
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowException):
+        return None
+    path.touch()  # prune_cache fshin sipas mtime-it
+    return table.to_pandas()
+
+
+def write_cached_frame(df, digest, cache_dir=None):
+    """Shkruan tabelën në mënyrë atomike; kthen False kur tipet nuk serializohen."""
+    if feather is None:
+        return False
+    path = cache_path(digest, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        feather.write_feather(df.reset_index(drop=True), tmp, compression="uncompressed")
+        os.replace(tmp, path)
+        prune_cache(path.parent)
+        return True
+    except (OSError, ValueError, TypeError, pa.ArrowException):
+        return False
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def prune_cache(cache_dir=None, max_entries=MAX_ENTRIES):
+    """Fshin hyrjet më të vjetra kur cache-i kalon `max_entries` skedarë."""
+    entries = sorted(Path(cache_dir or default_cache_dir()).glob("*.feather"),
+                     key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in entries[max_entries:]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
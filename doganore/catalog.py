@@ -0,0 +1,164 @@
+"""Katalogu i dataset-eve me shumë skedarë (p.sh. një CSV për muaj ose vit).
+
+Çdo skedar është një particion. Për secilin ruhen statistika nga kubi i tij:
+rreshtat, min/max i Vitit dhe i Muajit, vlerat e dallueshme të Llojit dhe
+Kategorisë, numri i kodeve HS dhe totalet vjetore (Viti, Lloji, Kategoria).
+Statistikat ruhen në një manifest JSON në cache, sipas (madhësia, mtime) të
+skedarit, ndaj një skedar lexohet vetëm kur shtohet ose ndryshon. Faqja zgjedh
+vitet nga katalogu dhe ngarkon vetëm particionet që e përmbajnë vitin. Një
+skedar që nuk lexohet shënohet me gabimin në manifest dhe nuk zgjidhet kurrë.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from doganore.aggregate import row_count
+from doganore.cache import default_cache_dir, source_stamp
+from doganore.normalize import MUAJT_SHQIP_MAP, detect_hs_col
+
+CATALOG_VERSION = 3
+MUAJT_NUMER = {v: k for k, v in MUAJT_SHQIP_MAP.items()}
+
+
+def discover(data_dir, pattern="*.csv"):
+    """Skedarët CSV të dosjes, të renditur sipas emrit."""
+    return sorted(str(p) for p in Path(data_dir).glob(pattern) if p.is_file())
+
+
+def _range(values):
+    values = [v for v in values if pd.notna(v)]
+    return [min(values), max(values)] if values else None
+
+
+def partition_stats(cube):
+    """Statistikat e një particioni nga kubi i tij (shih `doganore.cube`)."""
+    hs_col = detect_hs_col(cube)
+    stats = {"rows": row_count(cube), "hs_col": hs_col}
+    stats["vite"] = sorted(int(v) for v in cube["Viti"].dropna().unique()) if "Viti" in cube.columns else []
+    stats["viti"] = _range(stats["vite"])
+    if "Muaji" in cube.columns:
+        stats["muaji"] = _range(MUAJT_NUMER.get(str(m)) for m in cube["Muaji"].dropna().unique())
+    for name, col in [("lloji", "Lloji"), ("kategoria", "Kategoria")]:
+        stats[name] = sorted(str(v) for v in cube[col].dropna().unique()) if col in cube.columns else []
+    stats["hs_distinct"] = int(cube[hs_col].nunique()) if hs_col else 0
+    keys = [c for c in ["Viti", "Lloji", "Kategoria"] if c in cube.columns]
+    if keys and "Vlera" in cube.columns:
+        # Si grafiku vjetor i faqes: çelësat që mungojnë (NaN) nuk hyjnë në totale.
+        totals = cube.groupby(keys, observed=True, as_index=False)["Vlera"].sum()
+        types = {c: (int if c == "Viti" else str) for c in keys}
+        stats["totals"] = json.loads(totals.astype(types).to_json(orient="records"))
+    else:
+        stats["totals"] = []
+    return stats
+
+
+EMPTY_STATS = {
+    "rows": 0, "hs_col": None, "vite": [], "viti": None, "lloji": [], "kategoria": [], "hs_distinct": 0, "totals": [],
+}
+
+
+class Catalog:
+    """Particionet e një dosjeje dhe statistikat e tyre.
+
+    `load_cube(path)` duhet të kthejë kubin e një skedari; thirret vetëm për
+    skedarët që mungojnë në manifest ose kanë ndryshuar.
+    """
+
+    def __init__(self, paths, load_cube, manifest=None):
+        self.manifest = Path(manifest) if manifest else None
+        known = self._read_manifest()
+        self.partitions = []
+        dirty = False
+        for path in paths:
+            try:
+                stamp = list(source_stamp(path))
+            except OSError:
+                continue  # u fshi ndërkohë
+            entry = known.get(path)
+            if entry is None or entry["stamp"] != stamp:
+                entry = self._load_entry(path, stamp, load_cube)
+                dirty = True
+            self.partitions.append(entry)
+        if dirty or len(known) != len(self.partitions):
+            self._write_manifest()
+
+    @staticmethod
+    def _load_entry(path, stamp, load_cube):
+        # Një skedar i dëmtuar (p.sh. bosh, ende duke u shkruar) shënohet me gabimin dhe
+        # anashkalohet; lexohet sërish kur ndryshon (madhësia, mtime).
+        try:
+            return {"path": path, "stamp": stamp, "stats": partition_stats(load_cube(path))}
+        except Exception as e:
+            return {"path": path, "stamp": stamp, "stats": dict(EMPTY_STATS), "error": f"{type(e).__name__}: {e}"}
+
+    @classmethod
+    def for_dir(cls, data_dir, load_cube, pattern="*.csv", cache_dir=None):
+        """Katalogu i një dosjeje, me manifestin në dosjen e cache-it."""
+        key = hashlib.blake2b(str(Path(data_dir).resolve()).encode(), digest_size=8).hexdigest()
+        manifest = Path(cache_dir or default_cache_dir()) / f"catalog-{key}.json"
+        return cls(discover(data_dir, pattern), load_cube, manifest)
+
+    def _read_manifest(self):
+        if self.manifest is None or not self.manifest.exists():
+            return {}
+        try:
+            data = json.loads(self.manifest.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CATALOG_VERSION:
+            return {}
+        return {p["path"]: p for p in data.get("partitions", [])}
+
+    def _write_manifest(self):
+        if self.manifest is None:
+            return
+        self.manifest.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.manifest.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"version": CATALOG_VERSION, "partitions": self.partitions}, fh, ensure_ascii=False)
+        os.replace(tmp, self.manifest)
+
+    def values(self, name):
+        """Vlerat e dallueshme në të gjitha particionet ("vit", "lloji", "kategoria")."""
+        key = "vite" if name == "vit" else name
+        return sorted({v for p in self.partitions for v in p["stats"][key]})
+
+    def select(self, vit=None, muaji=None):
+        """Shtigjet e particioneve që mund të kenë rreshta për vitin/muajin (sipas statistikave)."""
+        out = []
+        for p in self.partitions:
+            if "error" in p:
+                continue
+            s = p["stats"]
+            if vit is not None and s["vite"] and vit not in s["vite"]:
+                continue
+            if muaji is not None and s.get("muaji") and not s["muaji"][0] <= muaji <= s["muaji"][1]:
+                continue
+            out.append(p["path"])
+        return out
+
+    def yearly_totals(self):
+        """Vlera sipas (Viti, Lloji, Kategoria) për gjithë historikun, pa lexuar particionet."""
+        frames = [pd.DataFrame(p["stats"]["totals"]) for p in self.partitions if p["stats"]["totals"]]
+        if not frames:
+            return pd.DataFrame(columns=["Viti", "Lloji", "Kategoria", "Vlera"])
+        totals = pd.concat(frames, ignore_index=True)
+        keys = [c for c in ["Viti", "Lloji", "Kategoria"] if c in totals.columns]
+        totals = totals.groupby(keys, as_index=False, sort=False)["Vlera"].sum()
+        for c in ["Lloji", "Kategoria"]:
+            if c in totals.columns:
+                totals[c] = totals[c].astype("category")
+        return totals
+
+    @property
+    def errors(self):
+        """[(shtegu, gabimi)] për particionet që nuk u lexuan."""
+        return [(p["path"], p["error"]) for p in self.partitions if "error" in p]
+
+    @property
+    def rows(self):
+        return sum(p["stats"]["rows"] for p in self.partitions)
@@ -0,0 +1,45 @@
+"""Përgatitja e të dhënave për grafikët Altair në server.
+
+Grafikët marrin vetëm seri të agreguara. Kur një seri kalon kufirin e rreshtave
+(`max_rows`), kategoritë më të vogla bashkohen te "Të tjera", ndaj payload-i
+drejt shfletuesit nuk rritet me madhësinë e dataset-it.
+"""
+import pandas as pd
+
+DEFAULT_MAX_ROWS = 5000
+OTHER_LABEL = "Të tjera"
+
+
+def monthly_series(frame, value="Vlera"):
+    """Një rresht për (Muaji, Kategoria) me shumën e `value`."""
+    keys = ["Muaji"] + (["Kategoria"] if "Kategoria" in frame.columns else [])
+    return frame.groupby(keys, observed=True, as_index=False)[value].sum()
+
+
+def cap_categories(data, max_rows=DEFAULT_MAX_ROWS, col="Kategoria", value="Vlera"):
+    """Mban kategoritë me vlerë më të madhe derisa seria të nxërë në `max_rows`.
+
+    `data` duhet të ketë vetëm kolonat-çelës dhe `value`; kategoritë e tepërta
+    mblidhen sipas çelësave të tjerë nën `OTHER_LABEL`.
+    """
+    if len(data) <= max_rows or col not in data.columns:
+        return data
+    keys = [c for c in data.columns if c not in (col, value)]
+    other_rows = len(data[keys].drop_duplicates()) if keys else 1
+    stats = data.groupby(col, observed=True)[value].agg(["sum", "size"]).sort_values("sum", ascending=False)
+    keep = stats.index[stats["size"].cumsum() <= max(max_rows - other_rows, 0)]
+
+    kept = data[data[col].isin(keep)]
+    rest = data[~data[col].isin(keep)]
+    if keys:
+        lumped = rest.groupby(keys, observed=True, as_index=False)[value].sum()
+    else:
+        lumped = pd.DataFrame({value: [rest[value].sum()]})
+    lumped[col] = OTHER_LABEL
+    out = pd.concat([kept.astype({col: object}), lumped[data.columns]], ignore_index=True)
+    return out
+
+
+def payload_bytes(data):
+    """Madhësia (bajte) e të dhënave të grafikut si JSON records."""
+    return len(data.to_json(orient="records", force_ascii=False).encode("utf-8"))
@@ -0,0 +1,152 @@
+"""KPI-të dhe Top HS nga rreshti i komandës, pa nisur Streamlit.
+
+    python -m doganore te_dhena.csv --viti 2024 --lloji Import
+    python -m doganore te_dhena.csv --viti all --lloji all --format csv --out raporte/
+    python -m doganore dosja_me_csv/ --viti 2024
+    python -m doganore te_dhena.csv --hs 39 --hs-niveli pozicioni
+
+Kur burimi është dosje, skedarët e saj trajtohen si particione (shih
+`doganore.catalog`); me një vit të vetëm lexohen vetëm particionet e atij viti.
+
+Pa filtra, përdoren vlerat fillestare të sidebar-it (viti dhe lloji i parë,
+4 kategoritë e para). `all` zgjeron vitin ose llojin në të gjitha vlerat, një
+raport për çdo kombinim.
+"""
+import argparse
+import itertools
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from doganore import engine
+from doganore.catalog import Catalog
+from doganore.filters import FilterIndex
+from doganore.hs_index import LEVELS, HSIndex
+from doganore.normalize import detect_hs_col
+
+ALL = "all"
+
+
+def year_arg(value):
+    """`--viti`: një vit numerik ose `all`."""
+    if value == ALL:
+        return value
+    try:
+        return float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"viti duhet të jetë numër ose '{ALL}', jo '{value}'") from None
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(prog="python -m doganore", description=__doc__.splitlines()[0])
+    p.add_argument("csv", help="Skedari CSV me të dhënat doganore, ose një dosje me CSV")
+    p.add_argument("--viti", nargs="+", type=year_arg, help=f"Viti/vitet; '{ALL}' për të gjitha")
+    p.add_argument("--lloji", nargs="+", help=f"Import/Eksport; '{ALL}' për të dyja")
+    p.add_argument("--kategoria", nargs="+", help=f"Kategoritë; '{ALL}' për të gjitha (default: 4 të parat)")
+    p.add_argument("--hs", nargs="+", default=[], help="Filtro sipas kodeve HS ose prefikseve (p.sh. 39 = kapitulli 39)")
+    p.add_argument("--top", type=int, default=engine.TOP_HS, help="Sa kode HS në renditje")
+    p.add_argument("--hs-niveli", choices=list(LEVELS), default="kodi", help="Niveli i renditjes HS")
+    p.add_argument("--format", choices=["json", "csv"], default="json")
+    p.add_argument("--out", help="json: skedari (default stdout); csv: dosja (default .)")
+    p.add_argument("--streaming", action="store_true", help="Lexim me copa, vetëm agregatet në memorie")
+    p.add_argument("--no-cache", action="store_true", help="Mos lexo/shkruaj cache-in në disk")
+    p.add_argument("--incremental", action="store_true",
+                   help="Përpuno vetëm rreshtat e shtuar në fund të skedarit që nga ekzekutimi i fundit")
+    return p.parse_args(argv)
+
+
+def _pick(requested, available, default):
+    if requested is None:
+        return default
+    if requested == [ALL]:
+        return available
+    return requested
+
+
+def _plain(value):
+    """Numrat e numpy si int/float të Python-it, për JSON."""
+    if value is None or isinstance(value, str):
+        return value
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def build_reports(cube, args):
+    index = FilterIndex(cube, detect_hs_col(cube))
+    hs_index = HSIndex(cube, index.hs_col) if index.hs_col else None
+    hs_pick = list(args.hs)
+    if hs_index is not None and args.hs:
+        # Prefikset lexohen si në kërkimin e faqes (vetëm shifrat, pa mbushje me zero)
+        # dhe zgjerohen në kodet e plota; pa asnjë përputhje, filtri mbetet bosh.
+        for prefix in args.hs:
+            if not hs_index.expand([prefix]):
+                print(f"Kujdes: asnjë kod HS nuk nis me '{prefix}'.", file=sys.stderr)
+        hs_pick = hs_index.expand(args.hs) or hs_pick
+    defaults = engine.default_filters(index)
+    vite = sorted(index.values("vit"))
+    vite = _pick(args.viti, vite, [defaults["vit"]])
+    llojet = _pick(args.lloji, sorted(index.values("lloji")), [defaults["lloji"]])
+    kategoria = _pick(args.kategoria, sorted(index.values("kategoria")), defaults["kategoria"])
+
+    reports = []
+    for vit, lloji in itertools.product(vite, llojet):
+        filters = dict(vit=vit, lloji=lloji, kategoria=kategoria, hs_col=index.hs_col, hs_pick=hs_pick)
+        cube_f = engine.filter_cube(cube, index, **filters)
+        top = hs_index.top(cube_f.index.to_numpy(), args.hs_niveli, args.top) if hs_index else pd.DataFrame()
+        reports.append({
+            "filtrat": {"viti": _plain(vit), "lloji": lloji, "kategoria": list(kategoria), "hs": args.hs},
+            "kpi": {k: _plain(v) for k, v in engine.kpis(cube_f, vit).items()},
+            "top_hs": [{"hs": str(r[index.hs_col]), "vlera": _plain(r["Vlera"])} for _, r in top.iterrows()],
+        })
+    return reports
+
+
+def write_json(reports, out):
+    text = json.dumps(reports, ensure_ascii=False, indent=2)
+    if out:
+        Path(out).write_text(text + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+def write_csv(reports, out):
+    out = Path(out or ".")
+    out.mkdir(parents=True, exist_ok=True)
+    kpi_rows, hs_rows = [], []
+    for rep in reports:
+        key = {"viti": rep["filtrat"]["viti"], "lloji": rep["filtrat"]["lloji"]}
+        kpi_rows.append({**key, **rep["kpi"]})
+        hs_rows += [{**key, "renditja": i, **r} for i, r in enumerate(rep["top_hs"], start=1)]
+    pd.DataFrame(kpi_rows).to_csv(out / "kpi.csv", index=False)
+    pd.DataFrame(hs_rows, columns=["viti", "lloji", "renditja", "hs", "vlera"]).to_csv(out / "top_hs.csv", index=False)
+
+
+def load(args):
+    use_cache = not args.no_cache
+    if not Path(args.csv).is_dir():
+        return engine.load(args.csv, args.streaming, use_cache, args.incremental)
+    catalog = Catalog.for_dir(args.csv, lambda path: engine.load(path, True, use_cache, args.incremental)[1])
+    for path, err in catalog.errors:
+        print(f"Kujdes: {path} u anashkalua ({err}).", file=sys.stderr)
+    vit = args.viti[0] if args.viti and len(args.viti) == 1 and args.viti[0] != ALL else None
+    return engine.load_partitions(catalog.select(vit=vit), True, use_cache, args.incremental)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        _, cube, _ = load(args)
+    except FileNotFoundError:
+        print(f"Skedari nuk u gjet: {args.csv}", file=sys.stderr)
+        return 1
+    except (pd.errors.EmptyDataError, pd.errors.ParserError) as e:
+        print(f"CSV-ja nuk u lexua ({args.csv}): {e}", file=sys.stderr)
+        return 1
+    if cube.empty:
+        print(f"Nuk ka të dhëna në {args.csv}.", file=sys.stderr)
+        return 1
+    reports = build_reports(cube, args)
+    (write_csv if args.format == "csv" else write_json)(reports, args.out)
+    return 0
@@ -0,0 +1,49 @@
+"""Kubi i agregateve që ushqen KPI-të dhe grafikët.
+
+Kubi ndërtohet një herë për çdo dataset: shuma e "Vlera"/"Sasia (kg)" dhe numri
+i rreshtave për çdo kombinim (Viti, Muaji, Lloji, Kategoria, HS). Mesatarja
+llogaritet si shuma / numri i rreshtave (vlerat që mungojnë numërohen si 0,
+njësoj si në faqen kryesore). Seksionet e faqes vetëm presin kubin.
+
+Me kodin HS në çelës, kubi mbetet afër numrit të rreshtave kur kodet janë
+shumë; grafikët sipas vitit presin prandaj `yearly_rollup`, një tabelë e
+vogël (Viti, Lloji, Kategoria) e llogaritur një herë nga kubi.
+"""
+import pandas as pd
+
+from doganore.aggregate import MEASURE_COLUMNS, ROW_COUNT, aggregate_frame, row_count
+from doganore.normalize import CATEGORICAL_COLUMNS
+
+
+def finalize_cube(agg):
+    """Viti numerik dhe kolonat kategorike, që filtrat të mos rikonvertojnë asgjë."""
+    if "Viti" in agg.columns:
+        agg["Viti"] = pd.to_numeric(agg["Viti"], errors="coerce")
+    for c in CATEGORICAL_COLUMNS:
+        if c in agg.columns:
+            agg[c] = agg[c].astype("category")
+    return agg.reset_index(drop=True)
+
+
+def build_cube(df, hs_col=None):
+    return finalize_cube(aggregate_frame(df, hs_col))
+
+
+def yearly_rollup(cube):
+    """Shumat e kubit sipas (Viti, Lloji, Kategoria); NaN në çelësa ruhen si grup më vete."""
+    keys = [c for c in ["Viti", "Lloji", "Kategoria"] if c in cube.columns]
+    measures = [c for c in MEASURE_COLUMNS + [ROW_COUNT] if c in cube.columns]
+    if not keys:
+        return cube[measures].sum().to_frame().T
+    return cube.groupby(keys, dropna=False, observed=True, sort=False, as_index=False)[measures].sum()
+
+
+def summarize(frame):
+    """{kolona: {"sum", "count", "mean"}} për një prerje të kubit."""
+    n = row_count(frame)
+    out = {}
+    for c in MEASURE_COLUMNS:
+        if c in frame.columns:
+            total = float(frame[c].sum())
+            out[c] = {"sum": total, "count": n, "mean": total / n if n else float("nan")}
+    return out
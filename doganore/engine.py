@@ -0,0 +1,164 @@
+"""Tubacioni i faqes pa Streamlit: lexim → normalizim → filtrim → agregim.
+
+E njëjta logjikë që përdor `streamlit_app.py`, e thirrshme nga skriptet,
+punët e natës dhe benchmark-et. Gabimet ngrihen si përjashtime; faqja vendos
+vetë si t'i shfaqë.
+"""
+import pandas as pd
+
+from doganore.aggregate import merge_aggregates, row_count
+from doganore.cache import read_cached_frame, source_digest, write_cached_frame
+from doganore.charts import monthly_series
+from doganore.cube import build_cube, finalize_cube, summarize
+from doganore.filters import FilterIndex
+from doganore.incremental import load_incremental
+from doganore.loader import read_csv_sniffed
+from doganore.metrics import stage
+from doganore.normalize import CATEGORICAL_COLUMNS, detect_hs_col, normalize_frame
+from doganore.streaming import stream_aggregate
+
+TOP_HS = 15
+
+
+def load_dataset(buf_or_path, use_cache=True):
+    """(rreshtat, kubi, info) për një CSV; me cache në disk sipas përmbajtjes."""
+    digest = source_digest(buf_or_path) if use_cache else None
+    if digest is not None:
+        df = read_cached_frame(digest)
+        if df is not None:
+            cube = read_cached_frame(f"{digest}-cube")
+            if cube is None:
+                cube = build_cube(df, detect_hs_col(df))
+            return df, cube, {"cache": True}
+    with stage("lexim") as rec:
+        df, info = read_csv_sniffed(buf_or_path)
+        rec["rows_out"] = len(df)
+    if df.empty:
+        return df, df, info
+    df = normalize_frame(df, categorical=True)
+    with stage("kubi", len(df)) as rec:
+        cube = build_cube(df, detect_hs_col(df))
+        rec["rows_out"] = len(cube)
+    if digest is not None:
+        write_cached_frame(df, digest)
+        write_cached_frame(cube, f"{digest}-cube")
+    return df, cube, info
+
+
+def load_dataset_streaming(buf_or_path, use_cache=True):
+    """(None, kubi, info): vetëm tabela e agreguar, e lexuar me copa."""
+    digest = f"{source_digest(buf_or_path)}-agg" if use_cache else None
+    if digest is not None:
+        agg = read_cached_frame(digest)
+        if agg is not None:
+            return None, agg, {"cache": True}
+    with stage("lexim me copa") as rec:
+        agg, info = stream_aggregate(buf_or_path)
+        rec["rows_out"] = len(agg)
+    if digest is not None:
+        write_cached_frame(agg, digest)
+    return None, agg, info
+
+
+def load(buf_or_path, streaming=False, use_cache=True, incremental=False):
+    """`incremental` (vetëm për shtigje): përpunon vetëm rreshtat e shtuar që nga ngarkimi i fundit."""
+    if incremental and use_cache and not hasattr(buf_or_path, "read"):
+        return load_incremental(buf_or_path, streaming)
+    loader = load_dataset_streaming if streaming else load_dataset
+    return loader(buf_or_path, use_cache=use_cache)
+
+
+def combine_partitions(parts):
+    """Bashkon (rreshtat, kubi, info) e disa particioneve në një dataset të vetëm."""
+    parts = [p for p in parts if not p[1].empty]
+    if not parts:
+        return None, pd.DataFrame(), {}
+    if len(parts) == 1:
+        return parts[0]
+    cube = finalize_cube(merge_aggregates([cube for _, cube, _ in parts]))
+    frames = [df for df, _, _ in parts if df is not None]
+    df = None
+    if frames:
+        df = pd.concat(frames, ignore_index=True)
+        for c in CATEGORICAL_COLUMNS:
+            if c in df.columns:
+                df[c] = df[c].astype("category")
+    info = {"partitions": len(parts), "cache": all(info.get("cache") for _, _, info in parts)}
+    if any("delta_rows" in info for _, _, info in parts):
+        info["delta_rows"] = sum(info.get("delta_rows", 0) for _, _, info in parts)
+    return df, cube, info
+
+
+def load_partitions(paths, streaming=False, use_cache=True, incremental=False):
+    return combine_partitions([load(p, streaming, use_cache, incremental) for p in paths])
+
+
+def default_filters(index):
+    """Filtrat fillestarë të sidebar-it: viti dhe lloji i parë, 4 kategoritë e para, pa HS."""
+    vite = sorted(index.values("vit"))
+    llojet = sorted(index.values("lloji")) or ["Import", "Eksport"]
+    kategorite = sorted(index.values("kategoria"))
+    return dict(
+        vit=vite[0] if vite else None,
+        lloji=llojet[0],
+        kategoria=kategorite[:4],
+        hs_col=index.hs_col,
+        hs_pick=[],
+    )
+
+
+def warm_filters(index):
+    """Kombinimet më të zakonshme: çdo vit × lloj me 4 kategoritë fillestare, pa HS."""
+    base = default_filters(index)
+    vite = sorted(index.values("vit")) or [None]
+    llojet = sorted(index.values("lloji")) or ["Import", "Eksport"]
+    return [dict(base, vit=vit, lloji=lloji) for vit in vite for lloji in llojet]
+
+
+def filter_views(cube, index, df=None, row_index=None, hs_index=None, **filters):
+    """Rezultatet e faqes që varen nga filtrat: prerja e kubit, KPI-të, seria mujore, Top HS, rreshtat."""
+    cube_f = index.apply(cube, **filters)
+    out = {"cube_f": cube_f, "kpi": kpis(cube_f, filters.get("vit"))}
+    if "Muaji" in cube_f.columns and "Vlera" in cube_f.columns:
+        out["mujore"] = monthly_series(cube_f)
+    if hs_index is not None and "Vlera" in cube_f.columns:
+        # Kubi ka RangeIndex, ndaj indeksi i prerjes janë pozicionet e saj.
+        out["top_hs[kodi]"] = hs_index.top(cube_f.index.to_numpy(), "kodi", TOP_HS)
+    if row_index is not None:
+        out["rreshta"] = row_index.positions(df, **filters)
+    return out
+
+
+def filter_cube(cube, index=None, **filters):
+    """Prerja e kubit për filtrat e dhënë (si `FilterIndex.apply`)."""
+    if index is None:
+        index = FilterIndex(cube, detect_hs_col(cube))
+    return index.apply(cube, **filters)
+
+
+def kpis(cube_f, vit=None):
+    """KPI-të e seksionit "Përmbledhje"; `None` aty ku faqja shfaq "—"."""
+    if "Lloji" in cube_f.columns:
+        sum_exp = summarize(cube_f[cube_f["Lloji"] == "Eksport"])
+        sum_imp = summarize(cube_f[cube_f["Lloji"] == "Import"])
+    else:
+        sum_exp, sum_imp = {}, {}
+    has_year = vit is not None and "Viti" in cube_f.columns
+    cube_vit = cube_f[cube_f["Viti"] == vit] if has_year else None
+    sum_vit = summarize(cube_vit) if has_year else {}
+
+    mean = sum_vit["Vlera"]["mean"] if "Vlera" in sum_vit else None
+    return {
+        "eksport_vlera": sum_exp["Vlera"]["sum"] if "Vlera" in sum_exp else None,
+        "eksport_sasia_kg": sum_exp["Sasia (kg)"]["sum"] if "Sasia (kg)" in sum_exp else None,
+        "import_vlera": sum_imp["Vlera"]["sum"] if "Vlera" in sum_imp else None,
+        "import_sasia_kg": sum_imp["Sasia (kg)"]["sum"] if "Sasia (kg)" in sum_imp else None,
+        "mesatarja_vjetore": None if mean is None or pd.isna(mean) else mean,
+        "transaksione_ne_vit": row_count(cube_vit) if has_year else None,
+    }
+
+
+def top_hs(cube_f, hs_col, n=TOP_HS):
+    """Kodet HS me vlerën më të madhe (kolonat: hs_col, "Vlera")."""
+    df_hs = cube_f.dropna(subset=[hs_col])
+    return df_hs.groupby(hs_col, as_index=False)["Vlera"].sum().sort_values("Vlera", ascending=False).head(n)
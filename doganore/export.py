@@ -0,0 +1,100 @@
+"""Tabela me faqe dhe eksporti me copa i rreshtave të filtruar."""
+import gzip
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow është opsional
+    pa = pq = None
+
+EXPORT_CHUNK_ROWS = 50_000
+PAGE_SIZES = [25, 50, 100, 500]
+
+# format → (prapashtesa e skedarit, MIME)
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+}
+if pq is not None:
+    FORMATS["Parquet"] = ("parquet", "application/vnd.apache.parquet")
+
+
+def fill_measures(part):
+    """Vlera/Sasia si numra, me 0 për qelizat bosh (si në tabelën e faqes)."""
+    part = part.copy()
+    for c in ["Vlera", "Sasia (kg)"]:
+        if c in part.columns:
+            part[c] = pd.to_numeric(part[c], errors="coerce").fillna(0)
+    return part
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def page_rows(df, rows, page, page_size):
+    """Materializon vetëm rreshtat e faqes `page` (nga 1) të pozicioneve `rows`."""
+    start = (page - 1) * page_size
+    return fill_measures(df.iloc[rows[start:start + page_size]])
+
+
+def iter_chunks(df, rows, chunk_rows=EXPORT_CHUNK_ROWS):
+    for start in range(0, len(rows), chunk_rows):
+        yield fill_measures(df.iloc[rows[start:start + chunk_rows]])
+
+
+def write_csv(parts, fileobj, empty=None):
+    header = True
+    for part in parts:
+        fileobj.write(part.to_csv(index=False, header=header).encode("utf-8"))
+        header = False
+    if header and empty is not None:
+        # Asnjë rresht: vetëm koka e kolonave, si `to_csv` mbi tabelë bosh.
+        fileobj.write(empty.to_csv(index=False).encode("utf-8"))
+
+
+def write_parquet(parts, fileobj, empty=None):
+    writer = schema = None
+    try:
+        for part in parts:
+            if writer is None:
+                # Skema merret nga tabela bosh kur jepet, përndryshe nga copa e parë.
+                schema = pa.Schema.from_pandas(part if empty is None else empty, preserve_index=False)
+                writer = pq.ParquetWriter(fileobj, schema)
+            writer.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False))
+        if writer is None:
+            schema = pa.Schema.from_pandas(empty if empty is not None else pd.DataFrame(), preserve_index=False)
+            writer = pq.ParquetWriter(fileobj, schema)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def export_parts(parts, fmt="CSV", empty=None):
+    """Shkruan copat (DataFrame) në një skedar të përkohshëm dhe e kthen të rikthyer në fillim.
+
+    Në memorie mbahet vetëm një copë në një kohë. `empty` (tabelë pa rreshta)
+    jep kolonat kur nuk ka asnjë copë.
+    """
+    # Pa buffer: objekti është `io.RawIOBase`, që `st.download_button` e lexon drejtpërdrejt.
+    out = tempfile.TemporaryFile(buffering=0)
+    if fmt == "Parquet":
+        write_parquet(parts, out, empty)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=out, mode="wb") as gz:
+            write_csv(parts, gz, empty)
+    else:
+        write_csv(parts, out, empty)
+    out.seek(0)
+    return out
+
+
+def export_file(df, rows=None, fmt="CSV", chunk_rows=EXPORT_CHUNK_ROWS):
+    """`export_parts` për pozicionet `rows` të `df`, me copa prej `chunk_rows` rreshtash."""
+    if rows is None:
+        rows = np.arange(len(df))
+    return export_parts(iter_chunks(df, rows, chunk_rows), fmt, fill_measures(df.iloc[:0]))
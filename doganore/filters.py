@@ -0,0 +1,119 @@
+"""Filtrat e sidebar-it (viti, lloji, kategoritë, HS)."""
+import numpy as np
+import pandas as pd
+
+
+def filter_mask(df, vit=None, lloji=None, kategoria=None, hs_col=None, hs_pick=None):
+    """Maska booleane e të njëjtave filtra si faqja kryesore."""
+    mask = pd.Series(True, index=df.index)
+    if vit is not None and "Viti" in df.columns:
+        mask &= pd.to_numeric(df["Viti"], errors="coerce") == vit
+    if lloji is not None and "Lloji" in df.columns:
+        mask &= df["Lloji"] == lloji
+    if kategoria and "Kategoria" in df.columns:
+        mask &= df["Kategoria"].isin(kategoria)
+    if hs_pick and hs_col:
+        mask &= df[hs_col].astype(str).isin(hs_pick)
+    return mask
+
+
+def apply_filters(df, **filters):
+    """Kthen rreshtat që kalojnë filtrat (një kopje e re, jo view)."""
+    return df[filter_mask(df, **filters)]
+
+
+def _code_dtype(n_codes):
+    """Tipi më i vogël i plotë që mban kodet 0..n_codes-1, -1 (NaN) dhe `kodi + 1`."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_codes <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class FilterIndex:
+    """Indeks i filtrave për një tabelë të caktuar (rreshta ose kub).
+
+    Për çdo kolonë filtri (Viti, Lloji, Kategoria, HS) ruhen kodet kategorike
+    dhe pozicionet e rreshtave të renditura sipas kodit, ndaj rreshtat e një
+    vlere janë një prerje e vazhdueshme. Një kombinim filtrash nis nga
+    predikati më selektiv dhe të tjerët kontrollohen vetëm mbi ato rreshta.
+    Rezultati është i njëjtë me `filter_mask`, në të njëjtën renditje. Kodet
+    ruhen në tipin më të vogël të plotë që i mban dhe pozicionet si int32 (nën
+    2^31 rreshta), ndaj indeksi zë 5–8 bajte për rresht e kolonë, jo 16.
+    """
+
+    def __init__(self, df, hs_col=None):
+        self.n = len(df)
+        self.hs_col = hs_col
+        self._cols = {}
+        for name, col in [("vit", "Viti"), ("lloji", "Lloji"), ("kategoria", "Kategoria"), ("hs", hs_col)]:
+            if col is None or col not in df.columns:
+                continue
+            s = df[col]
+            if name == "vit":
+                s = pd.to_numeric(s, errors="coerce")
+            elif name == "hs":
+                s = s.astype(str).where(s.notna())
+            codes, uniques = pd.factorize(s)
+            codes = codes.astype(_code_dtype(len(uniques)))
+            order = np.argsort(codes, kind="stable").astype(np.int32 if self.n < 2 ** 31 else np.int64)
+            # Kodet -1 (NaN) renditen të parat; offsets[i] është fillimi i kodit i.
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            offsets = np.concatenate([[0], np.cumsum(counts)]) + int((codes < 0).sum())
+            lookup = {v: i for i, v in enumerate(uniques)}
+            self._cols[name] = (codes, lookup, order, offsets, list(uniques))
+
+    def values(self, name):
+        """Vlerat e dallueshme të kolonës (pa NaN), sipas renditjes së shfaqjes."""
+        return list(self._cols[name][4]) if name in self._cols else []
+
+    def _codes_for(self, name, wanted):
+        lookup = self._cols[name][1]
+        return sorted({lookup[v] for v in wanted if v in lookup})
+
+    def rows(self, vit=None, lloji=None, kategoria=None, hs_col=None, hs_pick=None):
+        """Pozicionet (të renditura) e rreshtave që kalojnë filtrat."""
+        preds = []
+        if vit is not None and "vit" in self._cols:
+            preds.append(("vit", [vit]))
+        if lloji is not None and "lloji" in self._cols:
+            preds.append(("lloji", [lloji]))
+        if kategoria and "kategoria" in self._cols:
+            preds.append(("kategoria", kategoria))
+        if hs_pick and hs_col and "hs" in self._cols:
+            preds.append(("hs", hs_pick))
+        if not preds:
+            return np.arange(self.n)
+
+        sized = []
+        for name, wanted in preds:
+            codes = self._codes_for(name, wanted)
+            offsets = self._cols[name][3]
+            size = sum(int(offsets[c + 1] - offsets[c]) for c in codes)
+            if size == 0:
+                return np.arange(0)
+            sized.append((size, name, codes))
+        sized.sort(key=lambda x: x[0])
+
+        _, name, codes = sized[0]
+        _, _, order, offsets, _ = self._cols[name]
+        rows = np.concatenate([order[offsets[c]:offsets[c + 1]] for c in codes])
+        if len(codes) > 1:
+            rows.sort()
+        for _, name, codes in sized[1:]:
+            col_codes, lookup = self._cols[name][0], self._cols[name][1]
+            allowed = np.zeros(len(lookup) + 1, dtype=bool)
+            allowed[np.asarray(codes) + 1] = True
+            rows = rows[allowed[col_codes[rows] + 1]]
+        return rows
+
+    def positions(self, df, **filters):
+        """Si `rows`, por bie te `filter_mask` kur HS-ja e kërkuar nuk është e indeksuar."""
+        hs_col = filters.get("hs_col")
+        if filters.get("hs_pick") and hs_col and (hs_col != self.hs_col or "hs" not in self._cols):
+            return np.flatnonzero(filter_mask(df, **filters).to_numpy())
+        return self.rows(**filters)
+
+    def apply(self, df, **filters):
+        """Si `apply_filters`, për tabelën nga e cila u ndërtua indeksi."""
+        return df.iloc[self.positions(df, **filters)]
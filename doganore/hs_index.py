@@ -0,0 +1,121 @@
+"""Indeksi hierarkik i kodeve HS: kapitulli (2), pozicioni (4), nënpozicioni (6) dhe kodi i plotë.
+
+Kodet e normalizuara (shih `normalize_hs`) renditen një herë; çdo kod merr id-në
+e nyjës së tij në secilin nivel, ndaj një roll-up është një `bincount` mbi
+rreshtat e prerjes, jo një group-by mbi vargje. Totalet e Vlerës, Sasisë dhe
+rreshtave për çdo nyjë llogariten paraprakisht për gjithë tabelën dhe
+përdoren për renditjen e kërkimit me prefiks. Një kod më i shkurtër se niveli
+(p.sh. 4 shifra në nivelin 6) mbetet nyjë më vete.
+"""
+import numpy as np
+import pandas as pd
+
+from doganore.aggregate import MEASURE_COLUMNS, ROW_COUNT
+
+# Niveli → gjatësia e prefiksit; None është kodi i plotë.
+LEVELS = {"kodi": None, "kapitulli": 2, "pozicioni": 4, "nenpozicioni": 6}
+SEARCH_LIMIT = 200
+
+
+def hs_prefix(text):
+    """Prefiksi i shkruar nga përdoruesi: vetëm shifrat, pa mbushje me zero (ndryshe nga `normalize_hs`)."""
+    return "".join(ch for ch in str(text) if ch.isdigit())
+
+
+def _measure(frame, col):
+    if col not in frame.columns:
+        return None
+    return pd.to_numeric(frame[col], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+
+class HSIndex:
+    """Indeksi i kolonës HS për një tabelë të caktuar (zakonisht kubi).
+
+    `rows` në metodat më poshtë janë pozicione në këtë tabelë; për kubin, që ka
+    RangeIndex, pozicionet e një prerjeje janë `cube_f.index`.
+    """
+
+    def __init__(self, frame, hs_col):
+        self.hs_col = hs_col
+        self.codes, keys = pd.factorize(frame[hs_col].astype(str).where(frame[hs_col].notna()), sort=True)
+        self.keys = np.asarray(keys, dtype=object)
+        self.measures = {c: _measure(frame, c) for c in MEASURE_COLUMNS}
+        self.measures[ROW_COUNT] = (
+            _measure(frame, ROW_COUNT) if ROW_COUNT in frame.columns else np.ones(len(frame))
+        )
+        # Për çdo nivel: etiketat e nyjëve (të renditura) dhe nyja e çdo kodi të plotë.
+        self.levels = {}
+        for level, width in LEVELS.items():
+            if width is None:
+                self.levels[level] = (self.keys, np.arange(len(self.keys)))
+            else:
+                parent, labels = pd.factorize(pd.Series(self.keys, dtype=object).str[:width], sort=True)
+                self.levels[level] = (np.asarray(labels, dtype=object), parent)
+        self.totals = {level: self._rollup(None, level) for level in LEVELS}
+
+    def _range(self, prefix):
+        lo = np.searchsorted(self.keys, prefix, side="left")
+        hi = np.searchsorted(self.keys, prefix + "\uffff", side="left")
+        return lo, hi
+
+    def _key_sums(self, rows):
+        rows = np.arange(len(self.codes)) if rows is None else np.asarray(rows)
+        rows = rows[self.codes[rows] >= 0]
+        codes = self.codes[rows]
+        out = {}
+        for col, values in self.measures.items():
+            if values is not None:
+                out[col] = np.bincount(codes, weights=values[rows], minlength=len(self.keys))
+        out["_present"] = np.bincount(codes, minlength=len(self.keys)) > 0
+        return out
+
+    def _rollup(self, rows, level):
+        labels, parent = self.levels[level]
+        sums = self._key_sums(rows)
+        out = {c: np.bincount(parent, weights=v, minlength=len(labels)) for c, v in sums.items() if c != "_present"}
+        out["_present"] = np.bincount(parent, weights=sums["_present"], minlength=len(labels)) > 0
+        return out
+
+    def top(self, rows=None, level="kodi", n=15, value="Vlera"):
+        """Nyjet me `value` më të madhe (kolonat: hs_col, Vlera, Sasia (kg), rreshta).
+
+        Si `engine.top_hs` për nivelin "kodi": vetëm nyjet që kanë rreshta në prerje.
+        """
+        labels, _ = self.levels[level]
+        sums = self.totals[level] if rows is None else self._rollup(rows, level)
+        present = np.flatnonzero(sums["_present"])
+        order = present[np.argsort(-sums[value][present], kind="stable")][:n]
+        data = {self.hs_col: labels[order].astype(str)}
+        for c in MEASURE_COLUMNS:
+            if c in sums:
+                data[c] = sums[c][order]
+        data[ROW_COUNT] = sums[ROW_COUNT][order].astype(np.int64)
+        return pd.DataFrame(data)
+
+    def search(self, prefix, limit=SEARCH_LIMIT, value="Vlera"):
+        """Kodet e plota që nisin me `prefix`, sipas vlerës totale (typeahead).
+
+        Kodet janë të renditura, ndaj gama e prefiksit gjendet me kërkim binar.
+        """
+        prefix = hs_prefix(prefix)
+        lo, hi = self._range(prefix) if prefix else (0, len(self.keys))
+        if hi <= lo:
+            return []
+        totals = self.totals["kodi"].get(value)
+        idx = np.arange(lo, hi)
+        if totals is not None:
+            idx = idx[np.argsort(-totals[lo:hi], kind="stable")]
+        return [str(k) for k in self.keys[idx[:limit]]]
+
+    def expand(self, prefixes):
+        """Të gjitha kodet e plota nën prefikset e dhëna (p.sh. një kapitull i tërë)."""
+        out = []
+        for prefix in map(hs_prefix, prefixes):
+            if not prefix:
+                continue
+            lo, hi = self._range(prefix)
+            out.extend(str(k) for k in self.keys[lo:hi])
+        return out
+
+    def __len__(self):
+        return len(self.keys)
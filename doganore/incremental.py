@@ -0,0 +1,186 @@
+"""Ngarkim inkremental i një CSV-je që rritet me rreshta të shtuar në fund.
+
+Pas leximit të plotë ruhet një gjendje për skedarin: sa bajte u përpunuan,
+encoding-u, rreshti i kokës dhe gjurma e bajteve para kufirit. Në ngarkimin e
+radhës, nëse skedari vetëm është zgjatur (gjurma përputhet dhe kufiri bie në
+fund rreshti), lexohen vetëm bajtet e reja: normalizohen me të njëjtin
+`normalize_frame`, agregohen dhe bashkohen me kubin e ruajtur. Rreshtat e rinj
+ruhen si segment më vete, ndaj një përditësim mujor shkruan vetëm delta-n.
+Çdo mospërputhje (skedar i shkurtuar, i rishkruar, encoding tjetër) bie te
+leximi i plotë.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from doganore.aggregate import aggregate_frame, merge_aggregates
+from doganore.cache import default_cache_dir, read_cached_frame, source_stamp, write_cached_frame
+from doganore.cube import build_cube, finalize_cube
+from doganore.loader import csv_dtypes, read_csv_sniffed
+from doganore.metrics import stage
+from doganore.normalize import CATEGORICAL_COLUMNS, detect_hs_col, normalize_frame
+from doganore.streaming import CHUNK_ROWS, _stream, stream_aggregate
+
+STATE_VERSION = 3
+FINGERPRINT_BYTES = 64 * 1024
+# Mbi këtë numër segmentesh rreshtat rishkruhen si një segment i vetëm.
+MAX_SEGMENTS = 16
+
+
+def _key(path, streaming):
+    raw = f"{Path(path).resolve()}|{'agg' if streaming else 'rows'}|v{STATE_VERSION}"
+    return "inc-" + hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+
+
+def _state_path(key, cache_dir=None):
+    return Path(cache_dir or default_cache_dir()) / f"{key}.json"
+
+
+def fingerprint(path, offset):
+    """Hash i bajteve të para dhe i atyre menjëherë para `offset`."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        h.update(fh.read(min(FINGERPRINT_BYTES, offset)))
+        start = max(0, offset - FINGERPRINT_BYTES)
+        fh.seek(start)
+        h.update(fh.read(offset - start))
+    return h.hexdigest()
+
+
+def _header(path):
+    with open(path, "rb") as fh:
+        return fh.readline()
+
+
+def _ends_with_newline(path, offset):
+    if offset == 0:
+        return False
+    with open(path, "rb") as fh:
+        fh.seek(offset - 1)
+        return fh.read(1) == b"\n"
+
+
+def read_state(path, streaming=False, cache_dir=None):
+    sp = _state_path(_key(path, streaming), cache_dir)
+    try:
+        state = json.loads(sp.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return state if state.get("version") == STATE_VERSION else None
+
+
+def _write_state(state, cache_dir=None):
+    sp = _state_path(state["key"], cache_dir)
+    sp.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=sp.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(tmp, sp)
+
+
+def _categorize(df):
+    for c in CATEGORICAL_COLUMNS:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    return df
+
+
+def _full_load(path, streaming, cache_dir):
+    key = _key(path, streaming)
+    size = os.path.getsize(path)
+    if streaming:
+        with stage("lexim me copa") as rec:
+            cube, info = stream_aggregate(path)
+            rec["rows_out"] = len(cube)
+        df, segments = None, []
+    else:
+        with stage("lexim") as rec:
+            df, info = read_csv_sniffed(path)
+            rec["rows_out"] = len(df)
+        if df.empty:
+            return df, df, info
+        df = normalize_frame(df, categorical=True)
+        with stage("kubi", len(df)) as rec:
+            cube = build_cube(df, detect_hs_col(df))
+            rec["rows_out"] = len(cube)
+        segments = [f"{key}-rows-0"]
+    # Skedari u ndryshua gjatë leximit: gjendja nuk ruhet, herën tjetër lexohet sërish i plotë.
+    if os.path.getsize(path) != size or not write_cached_frame(cube, f"{key}-cube", cache_dir):
+        return df, cube, info
+    if df is not None and not write_cached_frame(df, segments[0], cache_dir):
+        return df, cube, info
+    _write_state({
+        "version": STATE_VERSION, "key": key, "offset": size, "encoding": info["encoding"],
+        "header": _header(path).decode("latin1"), "fingerprint": fingerprint(path, size),
+        "mtime_ns": source_stamp(path)[1],
+        "rows": len(df) if df is not None else info.get("rows"), "segments": segments,
+    }, cache_dir)
+    return df, cube, dict(info, incremental=False)
+
+
+def _read_delta(path, state, streaming):
+    """Normalizon bajtet pas `offset`; kthen (rreshtat ose None, agregati, numri i rreshtave)."""
+    with open(path, "rb") as fh:
+        fh.seek(state["offset"])
+        tail = fh.read()
+    buf = io.BytesIO(state["header"].encode("latin1") + tail)
+    if streaming:
+        agg, _, _, n_rows = _stream(buf, state["encoding"], CHUNK_ROWS)
+        return None, agg, n_rows
+    delta = pd.read_csv(buf, encoding=state["encoding"], dtype=csv_dtypes(buf, state["encoding"]))
+    delta = normalize_frame(delta, categorical=True)
+    return delta, aggregate_frame(delta, detect_hs_col(delta)), len(delta)
+
+
+def load_incremental(path, streaming=False, cache_dir=None):
+    """(rreshtat, kubi, info) si `engine.load`, duke përpunuar vetëm rreshtat e shtuar që nga hera e fundit."""
+    state = read_state(path, streaming, cache_dir)
+    size, mtime_ns = source_stamp(path)
+    usable = (
+        state is not None and size >= state["offset"]
+        # E njëjta madhësi me mtime tjetër: skedari u rishkrua, jo u zgjat.
+        and (size > state["offset"] or mtime_ns == state["mtime_ns"])
+        and _ends_with_newline(path, state["offset"])
+        and fingerprint(path, state["offset"]) == state["fingerprint"]
+    )
+    cube = read_cached_frame(f"{state['key']}-cube", cache_dir) if usable else None
+    segments = [read_cached_frame(s, cache_dir) for s in state["segments"]] if cube is not None else []
+    if cube is None or any(s is None for s in segments):
+        with stage("inkremental[i plotë]"):
+            return _full_load(path, streaming, cache_dir)
+
+    df = _categorize(pd.concat(segments, ignore_index=True)) if segments else None
+    if size == state["offset"]:
+        return df, cube, {"cache": True, "incremental": True, "delta_rows": 0}
+
+    with stage("inkremental[delta]") as rec:
+        try:
+            delta, agg, n_new = _read_delta(path, state, streaming)
+        except UnicodeDecodeError:
+            return _full_load(path, streaming, cache_dir)
+        rec["rows_out"] = n_new
+    cube = finalize_cube(merge_aggregates([cube, agg]))
+
+    key = state["key"]
+    if delta is not None:
+        seg = f"{key}-rows-{len(state['segments'])}"
+        df = _categorize(pd.concat([df, delta], ignore_index=True))
+        if len(state["segments"]) >= MAX_SEGMENTS:
+            seg = f"{key}-rows-0"
+            state["segments"] = []
+            to_write = df
+        else:
+            to_write = delta
+        if not write_cached_frame(to_write, seg, cache_dir):
+            return df, cube, {"incremental": True, "delta_rows": n_new}
+        state["segments"].append(seg)
+    if write_cached_frame(cube, f"{key}-cube", cache_dir):
+        state.update(offset=size, fingerprint=fingerprint(path, size), mtime_ns=mtime_ns,
+                     rows=(state["rows"] or 0) + n_new)
+        _write_state(state, cache_dir)
+    return df, cube, {"incremental": True, "delta_rows": n_new}
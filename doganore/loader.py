@@ -0,0 +1,94 @@
+"""Leximi i CSV-së me zbulim encoding-u nga një prefiks i kufizuar."""
+import codecs
+import csv
+import time
+
+import pandas as pd
+
+from doganore.normalize import hs_dtypes
+
+SNIFF_BYTES = 64 * 1024
+# Bajtet 0x80–0x9F janë kontrolle në latin1, por shkronja/simbole në cp1252 (p.sh. "€").
+_CP1252_RANGE = bytes(range(0x80, 0xA0))
+FALLBACK_ENCODING = "latin1"
+# Kur një bajt jo-UTF-8 del vetëm pas prefiksit: cp1252 mban "€", latin1 lexon çdo bajt.
+RETRY_ENCODINGS = ("cp1252", FALLBACK_ENCODING)
+
+
+def _read_prefix(buf_or_path, nbytes):
+    if hasattr(buf_or_path, "read"):
+        pos = buf_or_path.tell()
+        head = buf_or_path.read(nbytes)
+        buf_or_path.seek(pos)
+        return head.encode("utf-8") if isinstance(head, str) else head
+    with open(buf_or_path, "rb") as fh:
+        return fh.read(nbytes)
+
+
+def detect_encoding(head):
+    """Zgjedh encoding-un për një prefiks bajtesh: utf-8, cp1252 ose latin1."""
+    try:
+        # final=False: një karakter shumë-bajtësh i prerë në fund nuk është gabim.
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    if any(b in _CP1252_RANGE for b in head):
+        try:
+            head.decode("cp1252")
+            return "cp1252"
+        except UnicodeDecodeError:
+            pass
+    return FALLBACK_ENCODING
+
+
+def sniff_encoding(buf_or_path, nbytes=SNIFF_BYTES):
+    """Kthen (encoding, sekonda) duke lexuar vetëm `nbytes` bajtet e para."""
+    t0 = time.perf_counter()
+    enc = detect_encoding(_read_prefix(buf_or_path, nbytes))
+    return enc, time.perf_counter() - t0
+
+
+def next_encoding(encoding):
+    """Encoding-u i radhës pas një UnicodeDecodeError: cp1252, pastaj latin1; None pas latin1."""
+    if encoding == FALLBACK_ENCODING:
+        return None
+    return next(e for e in RETRY_ENCODINGS if e != encoding)
+
+
+def read_with_fallback(read, buf_or_path, encoding):
+    """Thërret `read(encoding)`; pas një UnicodeDecodeError provon cp1252, pastaj latin1.
+
+    Kthen (rezultati, encoding-u i përdorur).
+    """
+    pos = buf_or_path.tell() if hasattr(buf_or_path, "seek") else None
+    while True:
+        try:
+            return read(encoding), encoding
+        except UnicodeDecodeError:
+            encoding = next_encoding(encoding)
+            if encoding is None:
+                raise
+            if pos is not None:
+                buf_or_path.seek(pos)
+
+
+def csv_dtypes(buf_or_path, encoding, nbytes=SNIFF_BYTES):
+    """Tipet e detyruara të kolonave sipas rreshtit të kokës (kolona HS si tekst)."""
+    line = _read_prefix(buf_or_path, nbytes).split(b"\n", 1)[0].decode(encoding, errors="replace")
+    return hs_dtypes(next(csv.reader([line.rstrip("\r")]), []))
+
+
+def read_csv_sniffed(buf_or_path, nbytes=SNIFF_BYTES, **kwargs):
+    """Lexon CSV-në një herë të vetme me encoding-un e zbuluar.
+
+    Kthen (df, info) ku `info` mban encoding-un, kohën e zbulimit dhe të leximit.
+    Nëse një bajt jo-UTF-8 shfaqet vetëm pas prefiksit, leximi përsëritet me
+    cp1252 dhe, vetëm nëse edhe ai dështon, me latin1.
+    """
+    enc, sniff_s = sniff_encoding(buf_or_path, nbytes)
+    kwargs.setdefault("dtype", csv_dtypes(buf_or_path, enc, nbytes))
+    t0 = time.perf_counter()
+    df, enc = read_with_fallback(lambda e: pd.read_csv(buf_or_path, encoding=e, **kwargs), buf_or_path, enc)
+    info = {"encoding": enc, "sniff_s": sniff_s, "read_s": time.perf_counter() - t0}
+    return df, info
@@ -0,0 +1,178 @@
+"""Matja e fazave të një rinisjeje: koha, rreshtat hyrës/dalës dhe memoria maksimale.
+
+Kodi i matur shënon fazat me `stage(...)`; ato regjistrohen te `Profiler`-i
+aktiv i thread-it, ose nuk bëjnë asgjë kur s'ka të tillë. Memoria matet me
+`tracemalloc` (alokimet e Python-it dhe numpy-t, jo ato të Arrow-it), vetëm kur
+kërkohet, sepse ngadalëson kodin që alokon shumë. `tracemalloc` është i
+përbashkët për gjithë procesin: mbetet aktiv sa kohë që të paktën një
+profiler me memorie është duke matur, ndaj ngadalëson edhe sesionet e tjera.
+Edhe maksimumi i tij është i përbashkët: kur dy profiler-a matin njëkohësisht,
+secili sheh alokimet dhe `reset_peak`-et e tjetrit, ndaj memoria e një faze që
+mbivendoset me një profiler tjetër nuk regjistrohet (`peak_mb` mbetet None).
+"""
+import contextvars
+import json
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+_current = contextvars.ContextVar("doganore_profiler", default=None)
+_own_tracing = False
+# Profiler-at me memorie që janë duke matur; një profiler i braktisur pa `stop()`
+# (p.sh. rinisje e ndërprerë) largohet vetë kur fshihet.
+_tracing_users = weakref.WeakSet()
+_tracing_lock = threading.Lock()
+
+
+def _rss_mb():
+    """Maksimumi i RSS-së së procesit deri tani (MB); None kur s'mund të matet."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+class Profiler:
+    """Regjistri i fazave për një rinisje; fazat me të njëjtin emër mblidhen bashkë."""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.records = {}
+        self._open = []
+        self._t0 = None
+        # Sa herë një profiler tjetër me memorie nisi ndërsa ky po maste.
+        self._overlaps = 0
+        self.memory_shared = False
+
+    def start(self):
+        global _own_tracing
+        # Profiler-at nuk futen brenda njëri-tjetrit: i riu zëvendëson (dhe liron) të mëparshmin.
+        _current.set(self)
+        with _tracing_lock:
+            if self.memory:
+                for other in _tracing_users:
+                    other._overlaps += 1
+                    self._overlaps += 1
+                _tracing_users.add(self)
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _own_tracing = True
+            else:
+                _release_tracing()
+        self._t0 = time.perf_counter()
+        return self
+
+    def stop(self):
+        self.total_s = time.perf_counter() - self._t0
+        if _current.get() is self:
+            _current.set(None)
+        with _tracing_lock:
+            _tracing_users.discard(self)
+            _release_tracing()
+        return self
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        tracing = self.memory and tracemalloc.is_tracing()
+        # Regjistri krijohet në hapje, që fazat e jashtme të dalin para atyre të brendshme.
+        self.records.setdefault(name, {
+            "faza": name, "thirrje": 0, "s": 0.0, "rows_in": None, "rows_out": None,
+            "peak_mb": None, "rss_mb": None, "depth": len(self._open),
+        })
+        rec = {"rows_out": None}
+        if tracing:
+            # `reset_peak` fshin maksimumin edhe për fazat e hapura, ndaj ua ruajmë para.
+            peak = tracemalloc.get_traced_memory()[1]
+            for outer in self._open:
+                outer["_peak"] = max(outer["_peak"], peak)
+            tracemalloc.reset_peak()
+            rec["_base"] = rec["_peak"] = tracemalloc.get_traced_memory()[0]
+            rec["_overlaps"] = self._overlaps if len(_tracing_users) == 1 else None
+        self._open.append(rec)
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._open.pop()
+            peak_mb = None
+            if tracing and rec["_overlaps"] == self._overlaps:
+                peak_mb = (max(rec["_peak"], tracemalloc.get_traced_memory()[1]) - rec["_base"]) / 1024 ** 2
+            elif tracing:
+                self.memory_shared = True
+            self._record(name, elapsed, rows_in, rec["rows_out"], peak_mb)
+
+    def _record(self, name, elapsed, rows_in, rows_out, peak_mb):
+        r = self.records[name]
+        r["thirrje"] += 1
+        r["s"] += elapsed
+        if rows_in is not None:
+            r["rows_in"] = (r["rows_in"] or 0) + rows_in
+        if rows_out is not None:
+            r["rows_out"] = (r["rows_out"] or 0) + rows_out
+        if peak_mb is not None:
+            r["peak_mb"] = max(r["peak_mb"] or 0.0, peak_mb)
+        r["rss_mb"] = _rss_mb()
+
+    def rows(self):
+        """Fazat sipas renditjes së hapjes së parë, me emrat e brendshëm të zhvendosur."""
+        return [dict(r, faza="  " * r["depth"] + r["faza"]) for r in self.records.values()]
+
+    def to_json(self):
+        stages = [{k: v for k, v in r.items() if k != "depth"} for r in self.records.values()]
+        return json.dumps({"total_s": getattr(self, "total_s", None), "fazat": stages}, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix="doganore_stage"):
+        """Tekst në formatin e ekspozimit të Prometheus, një seri për çdo fazë."""
+        metrics = [
+            ("seconds", "s", "Koha e fazës në rinisjen e fundit (sekonda)."),
+            ("calls", "thirrje", "Sa herë u ekzekutua faza."),
+            ("rows_in", "rows_in", "Rreshtat hyrës."),
+            ("rows_out", "rows_out", "Rreshtat dalës."),
+            ("peak_bytes", "peak_mb", "Memoria maksimale e alokuar gjatë fazës (tracemalloc)."),
+        ]
+        lines = []
+        for suffix, key, help_text in metrics:
+            name = f"{prefix}_{suffix}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for r in self.records.values():
+                value = r[key]
+                if value is None:
+                    continue
+                if key == "peak_mb":
+                    value = int(value * 1024 ** 2)
+                label = r["faza"].replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                lines.append(f'{name}{{stage="{label}"}} {value}')
+        rss = _rss_mb()
+        if rss is not None:
+            name = f"{prefix}_process_rss_peak_bytes"
+            lines += [f"# HELP {name} Maksimumi i RSS-së së procesit.", f"# TYPE {name} gauge",
+                      f"{name} {int(rss * 1024 ** 2)}"]
+        return "\n".join(lines) + "\n"
+
+
+def _release_tracing():
+    """Ndal `tracemalloc`-un që nisëm vetë kur s'ka më profiler që mat memorien (nën `_tracing_lock`)."""
+    global _own_tracing
+    if _own_tracing and not _tracing_users and tracemalloc.is_tracing():
+        tracemalloc.stop()
+        _own_tracing = False
+
+
+@contextmanager
+def stage(name, rows_in=None):
+    """Shënon një fazë te profiler-i aktiv; pa profiler kthen një dict që injorohet."""
+    prof = _current.get()
+    if prof is None:
+        yield {"rows_out": None}
+        return
+    with prof.stage(name, rows_in) as rec:
+        yield rec
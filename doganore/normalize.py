@@ -0,0 +1,108 @@
+"""Normalizimi i kolonave: emrat kanonikë, pastrimi numerik, muajt në shqip dhe kodet HS."""
+import numpy as np
+import pandas as pd
+
+from doganore.metrics import stage
+from doganore.numeric import coerce_number_series
+
+MUAJT_SHQIP_MAP = {
+    1: "Janar", 2: "Shkurt", 3: "Mars", 4: "Prill", 5: "Maj", 6: "Qershor",
+    7: "Korrik", 8: "Gusht", 9: "Shtator", 10: "Tetor", 11: "Nëntor", 12: "Dhjetor"
+}
+
+ALIASES = {
+    "Vlera": ["Vlera (lekë)", "Vlera (€)", "Value", "Vlere", "Amount", "Value (€)"],
+    "Sasia (kg)": ["Sasia", "Sasi", "Quantity", "Sasia (kg)"],
+    "Muaji": ["Muaji", "Month", "Muaj"],
+    "Viti": ["Viti", "Year"],
+    "Lloji": ["Lloji", "Type", "Tipi", "Import/Eksport"],
+    "Kategoria": ["Kategoria", "Kategori", "Category"],
+}
+
+POSSIBLE_HS = [
+    "Kodi doganor", "Kodi_doganor", "KodiDoganor", "Kodi HS", "HS Code", "HS_Code", "HS",
+    "Kodi", "Kodi i mallrave", "HS6", "HS8", "Nomenklatura", "Kodi NK", "Kodi_NK", "NK"
+]
+
+# Kolonat me pak vlera të dallueshme ruhen si `category`.
+CATEGORICAL_COLUMNS = ["Kategoria", "Lloji", "Muaji"]
+
+
+def apply_aliases(df):
+    df = df.rename(columns=lambda x: str(x).strip())
+    for canon, alts in ALIASES.items():
+        for a in alts:
+            if a in df.columns:
+                if canon != a:
+                    df[canon] = df[a]
+                break
+    return df
+
+
+def detect_hs_col(df):
+    for c in df.columns:
+        if str(c).strip() in POSSIBLE_HS:
+            return c
+    return None
+
+
+def hs_dtypes(columns):
+    """`dtype=str` për kolonat HS, që `read_csv` të mos i kthejë kodet në numra.
+
+    Si numër "8471.30" bëhet 8471.3 dhe "0813" bëhet 813: nënpozicioni humbet
+    dhe i njëjti kod do të normalizohej ndryshe sipas tipit të kolonës.
+    """
+    return {c: str for c in columns if str(c).strip() in POSSIBLE_HS}
+
+
+def _hs_text(value):
+    if isinstance(value, str):
+        return value
+    value = float(value)
+    return f"{value:.0f}" if value.is_integer() else repr(value)
+
+
+def normalize_hs(codes):
+    """Kodet HS si vargje shifrash: pa pika/hapësira dhe me zeron fillestare të rikthyer.
+
+    Kodet HS kanë gjatësi çift (2, 4, 6, 8, 10); kur një kod ruhet si numër,
+    "0813" bëhet 813, ndaj një kodi me gjatësi tek i shtohet një "0" përpara.
+    Vlerat numerike kalojnë nga e njëjta rrugë si tekstet, por zerot e fundit
+    (8471.30) mund të rikthehen vetëm kur kolona lexohet si tekst (`hs_dtypes`).
+    Punohet mbi vlerat e dallueshme, jo rresht për rresht.
+    """
+    ids, uniques = pd.factorize(codes)
+    keys = pd.Series([_hs_text(v) for v in uniques], dtype=str).str.replace(r"[^0-9]", "", regex=True)
+    keys = keys.where(keys.str.len() % 2 == 0, "0" + keys).replace({"": None})
+    labels = np.append(keys.to_numpy(dtype=object), None)
+    return pd.Series(labels[ids], index=codes.index, name=codes.name, dtype="str")
+
+
+def map_months(muaji):
+    mtmp = pd.to_numeric(muaji, errors="coerce")
+    out = mtmp.map(MUAJT_SHQIP_MAP).fillna(muaji.astype(str).str.strip())
+    return out.replace({"": "Pa të dhëna"})
+
+
+def normalize_frame(df, categorical=False):
+    """Aliaset → pastrim numerik → muajt në shqip → kodet HS, njësoj si në faqen kryesore."""
+    n = len(df)
+    with stage("aliaset", n):
+        df = apply_aliases(df)
+    for c in ["Vlera", "Sasia (kg)"]:
+        if c in df.columns:
+            with stage(f"coerce_number[{c}]", n):
+                df[c] = coerce_number_series(df[c])
+    if "Muaji" in df.columns:
+        with stage("muajt", n):
+            df["Muaji"] = map_months(df["Muaji"])
+    hs_col = detect_hs_col(df)
+    if hs_col is not None:
+        with stage("kodet_hs", n):
+            df[hs_col] = normalize_hs(df[hs_col])
+    if categorical:
+        with stage("kategorike", n):
+            for c in CATEGORICAL_COLUMNS:
+                if c in df.columns:
+                    df[c] = df[c].astype("category")
+    return df
@@ -0,0 +1,102 @@
+"""Pastrim numerik për kolonat "Vlera" dhe "Sasia (kg)"."""
+import numpy as np
+import pandas as pd
+
+try:  # pyarrow vjen me streamlit; pa të, përdoret rruga me objekte Python.
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover
+    pa = pc = None
+
+# Renditja ka rëndësi: "Lek" hiqet para "lekë", njësoj si në coerce_number.
+CURRENCY_TOKENS = ("€", "Lek", "lekë", "LEK")
+EU_FORMAT = r"^[^,]*\.[^,]*,[^.,]*$"
+
+
+def coerce_number(s):
+    if pd.isna(s): return np.nan
+    if isinstance(s, (int, float, np.number)): return s
+    s = str(s)
+    s = s.replace("€", "").replace("Lek", "").replace("lekë", "").replace("LEK", "")
+    s = s.replace("\xa0", " ").strip()
+    if s.count(",") == 1 and s.count(".") >= 1 and s.rfind(",") > s.rfind("."):
+        s = s.replace(".", "").replace(",", ".")
+    else:
+        s = s.replace(",", "")
+    try:
+        return float(s)
+    except Exception:
+        return pd.to_numeric(s, errors="coerce")
+
+
+def _parse_float(s):
+    # E njëjta rrugë si fundi i `coerce_number`: float(), pastaj pd.to_numeric
+    # (që pranon edhe raste si "5E 3", me hapësirë para eksponentit).
+    try:
+        return float(s)
+    except Exception:
+        return pd.to_numeric(s, errors="coerce")
+
+
+def _to_float(txt):
+    """Konverton një Series me tekst në float64 me semantikën e `float()`."""
+    if pa is not None:
+        try:
+            # Arrow pranon një nënbashkësi të rreptë të asaj që pranon float().
+            return pc.cast(pa.array(txt), pa.float64()).to_numpy(zero_copy_only=False)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, TypeError):
+            pass
+    values = txt.to_numpy(dtype=object)
+    try:
+        # astype(float64) mbi objekte thërret float() për çdo qelizë, por në C.
+        return values.astype(np.float64)
+    except (ValueError, TypeError):
+        pass
+    out = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64, copy=True)
+    ok = ~np.isnan(out)
+    try:
+        out[ok] = values[ok].astype(np.float64)
+    except (ValueError, TypeError):
+        out[ok] = [_parse_float(v) for v in values[ok]]
+    # Mbetjet (p.sh. "1_000", "nan") provohen një nga një – zakonisht janë pak.
+    bad = ~ok
+    if bad.any():
+        out[bad] = [_parse_float(v) for v in values[bad]]
+    return out
+
+
+def _as_text(ser):
+    if pa is not None:
+        return ser.astype("string[pyarrow]")
+    return ser.astype(str)
+
+
+def coerce_number_series(ser):
+    """Versioni kolonor i `coerce_number` – i njëjti rezultat, pa thirrje për qelizë.
+
+    Kolonat numerike kthehen siç janë. Kolonat me tekst pastrohen me metodat
+    `.str` të pandas; kolonat e përziera (numra + tekst) kalojnë te `coerce_number`.
+    """
+    if pd.api.types.is_numeric_dtype(ser):
+        return ser
+    if pd.api.types.infer_dtype(ser, skipna=True) not in ("string", "empty"):
+        return ser.map(coerce_number)
+
+    out = np.full(len(ser), np.nan, dtype=np.float64)
+    valid = ser.notna().to_numpy()
+    if not valid.any():
+        return pd.Series(out, index=ser.index, name=ser.name)
+
+    s = _as_text(ser[valid])
+    for tok in CURRENCY_TOKENS:
+        s = s.str.replace(tok, "", regex=False)
+    s = s.str.replace("\xa0", " ", regex=False).str.strip()
+
+    # Një presje e vetme, pas së paku një pike: "1.234,56" → formati evropian.
+    eu = s.str.contains(EU_FORMAT, regex=True)
+    txt = s.str.replace(",", "", regex=False)
+    if eu.any():
+        txt = txt.mask(eu, s[eu].str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+
+    out[valid] = _to_float(txt)
+    return pd.Series(out, index=ser.index, name=ser.name)
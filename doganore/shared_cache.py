@@ -0,0 +1,145 @@
+"""Cache i përbashkët i rezultateve të filtrave për të gjitha sesionet e procesit.
+
+Streamlit i ekzekuton sesionet si thread-e të të njëjtit proces, ndaj një
+analist që zgjedh filtrat që një tjetër sapo ka parë merr prerjen e kubit, KPI-të
+dhe seritë e gatshme. Çelësi është dataset-i, emri i rezultatit dhe gjendja e
+normalizuar e filtrave (viti, lloji, kategoritë dhe kodet HS të renditura).
+Hyrjet e përdorura më rrallë hiqen (LRU) kur memoria e vlerësuar kalon
+`max_bytes`. Rezultatet ndahen mes sesioneve dhe nuk duhen modifikuar.
+
+`Warmer` llogarit paraprakisht, në një grup thread-esh, kombinimet më të
+zakonshme sapo ngarkohet një dataset.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+MAX_BYTES = int(os.environ.get("DOGANORE_RESULT_CACHE_MB", 256)) * 1024 ** 2
+WARM_WORKERS = int(os.environ.get("DOGANORE_WARM_WORKERS", 2))
+
+
+def filter_key(vit=None, lloji=None, kategoria=None, hs_pick=None, **_):
+    """Gjendja e normalizuar e filtrave: renditja e zgjedhjeve nuk ndryshon çelësin."""
+    return (vit, lloji, tuple(sorted(kategoria or ())), tuple(sorted(hs_pick or (), key=str)))
+
+
+def sizeof(value):
+    """Vlerësim i memories (bajte) për DataFrame, array, dict/tuple ose skalarë."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """LRU me kufi memorieje, i sigurt për përdorim nga disa thread-e."""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key][0]
+
+    def put(self, key, value):
+        size = sizeof(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if key in self._items:
+                self.bytes -= self._items.pop(key)[1]
+            self._items[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, old) = self._items.popitem(last=False)
+                self.bytes -= old
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Vlera e ruajtur, ose `compute()` e ruajtur për herët e tjera.
+
+        Dy thread-e që mungojnë njëkohësisht mund ta llogarisin të dy; fiton i fundit.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else None,
+            "evictions": self.evictions, "entries": len(self._items), "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class Warmer:
+    """Llogarit paraprakisht rezultatet e filtrave në sfond, një herë për dataset."""
+
+    def __init__(self, cache, workers=WARM_WORKERS):
+        self.cache = cache
+        self.workers = workers
+        self._pool = None
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def warm(self, dataset, combos, compute):
+        """Nis llogaritjen e `compute(**filtrat)` ({emri: vlera}) për çdo kombinim.
+
+        Kthen numrin e kombinimeve të nisura; 0 kur dataset-i është ngrohur më parë.
+        """
+        with self._lock:
+            if dataset in self._seen or self.workers <= 0:
+                return 0
+            self._seen.add(dataset)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="doganore-warm")
+        for filters in combos:
+            self._pool.submit(self._run, dataset, filters, compute)
+        return len(combos)
+
+    def _run(self, dataset, filters, compute):
+        fkey = filter_key(**filters)
+        for name, value in compute(**filters).items():
+            key = (dataset, name, fkey)
+            if key not in self.cache:
+                self.cache.put(key, value)
+
+
+RESULTS = ResultCache()
+WARMER = Warmer(RESULTS)
@@ -0,0 +1,124 @@
+"""Lexim me copa për CSV që nuk nxihen në memorie.
+
+Çdo copë kalon nga i njëjti normalizim (aliaset, pastrimi numerik, muajt) dhe
+mblidhet menjëherë në tabelën e agreguar; rreshtat nuk mbahen në memorie.
+"""
+import time
+
+import pandas as pd
+
+from doganore.aggregate import aggregate_frame, merge_aggregates
+from doganore.cube import finalize_cube
+from doganore.export import export_parts, fill_measures
+from doganore.filters import apply_filters
+from doganore.loader import csv_dtypes, next_encoding, read_with_fallback, sniff_encoding
+from doganore.normalize import detect_hs_col, normalize_frame
+
+CHUNK_ROWS = 250_000
+# Sa copa të agreguara mbahen para se të bashkohen në akumulator.
+FOLD_EVERY = 8
+
+
+def iter_chunks(buf_or_path, encoding, chunksize=CHUNK_ROWS):
+    """Jep copat e normalizuara të CSV-së."""
+    dtype = csv_dtypes(buf_or_path, encoding)
+    with pd.read_csv(buf_or_path, encoding=encoding, chunksize=chunksize, dtype=dtype) as reader:
+        for chunk in reader:
+            yield normalize_frame(chunk)
+
+
+def _stream(buf_or_path, encoding, chunksize):
+    acc, pending = None, []
+    hs_col, n_chunks, n_rows = None, 0, 0
+    for chunk in iter_chunks(buf_or_path, encoding, chunksize):
+        if n_chunks == 0:
+            hs_col = detect_hs_col(chunk)
+        n_chunks += 1
+        n_rows += len(chunk)
+        pending.append(aggregate_frame(chunk, hs_col))
+        if len(pending) >= FOLD_EVERY:
+            acc = merge_aggregates([acc] + pending)
+            pending = []
+    return merge_aggregates([acc] + pending), hs_col, n_chunks, n_rows
+
+
+def stream_aggregate(buf_or_path, chunksize=CHUNK_ROWS):
+    """Lexon CSV-në me copa dhe kthen (tabela e agreguar, info)."""
+    enc, sniff_s = sniff_encoding(buf_or_path)
+    t0 = time.perf_counter()
+    (agg, hs_col, n_chunks, n_rows), enc = read_with_fallback(
+        lambda e: _stream(buf_or_path, e, chunksize), buf_or_path, enc
+    )
+    agg = finalize_cube(agg)
+    info = {
+        "encoding": enc, "sniff_s": sniff_s, "read_s": time.perf_counter() - t0,
+        "chunks": n_chunks, "rows": n_rows, "hs_col": hs_col,
+    }
+    return agg, info
+
+
+def iter_filtered(buf_or_path, encoding, chunksize=CHUNK_ROWS, **filters):
+    """Jep vetëm copat jo-bosh të rreshtave që kalojnë filtrat."""
+    for chunk in iter_chunks(buf_or_path, encoding, chunksize):
+        part = apply_filters(chunk, **filters)
+        if not part.empty:
+            yield part
+
+
+def _scan(buf_or_path, encoding, limit, chunksize, filters):
+    parts, n = [], 0
+    for part in iter_filtered(buf_or_path, encoding, chunksize, **filters):
+        parts.append(part)
+        n += len(part)
+        if limit is not None and n >= limit:
+            break
+    return parts
+
+
+def scan_rows(buf_or_path, limit=None, chunksize=CHUNK_ROWS, **filters):
+    """Lexon sërish skedarin dhe kthen vetëm rreshtat që kalojnë filtrat.
+
+    Përdoret për tabelën e detajeve; ndalon sapo mblidhen `limit` rreshta.
+    """
+    if hasattr(buf_or_path, "seek"):
+        buf_or_path.seek(0)
+    encoding, _ = sniff_encoding(buf_or_path)
+    parts, _ = read_with_fallback(lambda e: _scan(buf_or_path, e, limit, chunksize, filters), buf_or_path, encoding)
+    if not parts:
+        return pd.DataFrame()
+    out = pd.concat(parts, ignore_index=True)
+    return out if limit is None else out.head(limit)
+
+
+def export_rows(sources, fmt="CSV", chunksize=CHUNK_ROWS, **filters):
+    """Eksporton të gjitha rreshtat e filtruar të `sources` (shtigje ose buffer-a), copë pas cope.
+
+    Si `scan_rows` pa `limit`, por copat shkruhen menjëherë në skedar (shih
+    `export_parts`), ndaj në memorie mbahet vetëm një copë. Kur një burim
+    dështon me UnicodeDecodeError pas prefiksit, eksporti nis nga e para me
+    encoding-un e radhës për atë burim.
+    """
+    encodings = {}
+    for src in sources:
+        if hasattr(src, "seek"):
+            src.seek(0)
+        encodings[id(src)] = sniff_encoding(src)[0]
+    current = None
+
+    def parts():
+        nonlocal current
+        for src in sources:
+            current = src
+            if hasattr(src, "seek"):
+                src.seek(0)
+            for part in iter_filtered(src, encodings[id(src)], chunksize, **filters):
+                yield fill_measures(part)
+
+    while True:
+        try:
+            return export_parts(parts(), fmt)
+        except UnicodeDecodeError:
+            enc = next_encoding(encodings[id(current)])
+            if enc is None:
+                raise
+            encodings[id(current)] = enc
@@ -1,119 +1,285 @@
+import os
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import altair as alt
 
+from doganore import engine
+from doganore.cache import source_stamp
+from doganore.catalog import Catalog, discover
+from doganore.charts import DEFAULT_MAX_ROWS, cap_categories, monthly_series, payload_bytes
+from doganore.cube import yearly_rollup
+from doganore.export import FORMATS, PAGE_SIZES, export_file, page_count, page_rows
+from doganore.filters import FilterIndex
+from doganore.hs_index import HSIndex
+from doganore.metrics import Profiler, stage
+from doganore.normalize import MUAJT_SHQIP_MAP, detect_hs_col
+from doganore.shared_cache import RESULTS, WARMER, filter_key
+from doganore.streaming import export_rows, scan_rows
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Konfigurimi
 # ──────────────────────────────────────────────────────────────────────────────
 st.set_page_config(page_title="Të dhëna doganore - Shqip", layout="wide")
 st.title("📊 Platforma e të dhënave mbi importet dhe eksportet doganore")
 
-@st.cache_data(show_spinner=False)
-def load_csv_robust(buf_or_path):
-    encodings = ["utf-8", "latin1", "ISO-8859-1", "cp1252"]
-    last_err = None
-    for enc in encodings:
-        try:
-            return pd.read_csv(buf_or_path, encoding=enc)
-        except Exception as e:
-            last_err = e
-            continue
-    st.error(f"❌ Nuk u arrit të lexohet CSV-ja me asnjë encoding të njohur. {last_err}")
-    return pd.DataFrame()
-
-def coerce_number(s):
-    if pd.isna(s): return np.nan
-    if isinstance(s, (int, float, np.number)): return s
-    s = str(s)
-    s = s.replace("€", "").replace("Lek", "").replace("lekë", "").replace("LEK", "")
-    s = s.replace("\xa0", " ").strip()
-    if s.count(",") == 1 and s.count(".") >= 1 and s.rfind(",") > s.rfind("."):
-        s = s.replace(".", "").replace(",", ".")
-    else:
-        s = s.replace(",", "")
+# Tabelat e ngarkuara mbahen me cache_resource: një objekt i vetëm (read-only) për të gjitha
+# sesionet, pa kopjen që cache_data bën (pickle/unpickle) në çdo rinisje. Çelësi përfshin
+# (madhësia, mtime), ndaj çdo ndryshim i skedarit jep një hyrje të re: `max_entries` i
+# kufizon, që versionet e vjetra të mos mbeten në memorie gjatë gjithë jetës së procesit.
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_dataset(buf_or_path, stamp=None, incremental=False):
+    # Cache në disk sipas përmbajtjes: pas rinisjes lexohet Feather, jo CSV-ja.
+    # Kubi i agregateve ndërtohet këtu, një herë për dataset, dhe ruhet pranë tabelës.
+    # Me `incremental`, një skedar i zgjatur përpunon vetëm rreshtat e shtuar.
     try:
-        return float(s)
-    except Exception:
-        return pd.to_numeric(s, errors="coerce")
+        return engine.load(buf_or_path, incremental=incremental)
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        st.error(f"❌ Nuk u arrit të lexohet CSV-ja. {e}")
+        return pd.DataFrame(), pd.DataFrame(), {}
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_dataset_streaming(buf_or_path, stamp=None, incremental=False):
+    # Vetëm tabela e agreguar mbahet në memorie; rreshtat lexohen kur kërkohen.
+    try:
+        return engine.load(buf_or_path, streaming=True, incremental=incremental)
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        st.error(f"❌ Nuk u arrit të lexohet CSV-ja. {e}")
+        return None, pd.DataFrame(), {}
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_catalog(data_dir, stamps, incremental=False):
+    # Statistikat e particioneve; skedarët e rinj/ndryshuar lexohen me copa vetëm një herë.
+    return Catalog.for_dir(data_dir, lambda path: engine.load(path, streaming=True, incremental=incremental)[1])
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_partitions(paths, stamps, streaming=False, incremental=False):
+    # Vetëm particionet e zgjedhura; secili lexohet (dhe ruhet në cache) më vete.
+    loader = load_dataset_streaming if streaming else load_dataset
+    return engine.combine_partitions([loader(path, stamp, incremental) for path, stamp in zip(paths, stamps)])
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_filter_indexes(_df, _cube, key):
+    # Ndërtohen një herë për dataset (sipas `key`) dhe ndahen (read-only) mes sesioneve.
+    hs = detect_hs_col(_cube)
+    row_index = FilterIndex(_df, hs) if _df is not None and not _df.empty else None
+    hs_index = HSIndex(_cube, hs) if hs is not None else None
+    return FilterIndex(_cube, hs), row_index, hs_index
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_rollup(_cube, key):
+    # Totalet (Viti, Lloji, Kategoria) për grafikët vjetorë: pak rreshta, në vend të skanimit të kubit.
+    return yearly_rollup(_cube)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_detail_rows(buf_or_path, stamp, limit, **filters):
+    if not isinstance(buf_or_path, tuple):
+        return scan_rows(buf_or_path, limit=limit, **filters)
+    parts, n = [], 0
+    for path in buf_or_path:
+        part = scan_rows(path, limit=limit - n, **filters)
+        parts.append(part)
+        n += len(part)
+        if n >= limit:
+            break
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+def show_table(data, rows, key, export=None):
+    # Materializohet vetëm faqja e dukshme; skedari i shkarkimit ndërtohet me copa kur klikohet butoni.
+    # `export(fmt)`, kur jepet, zëvendëson eksportin e `data[rows]` (p.sh. rileximi i skedarit).
+    c1, c2, c3 = st.columns([1, 1, 2])
+    page_size = c1.selectbox("Rreshta për faqe", PAGE_SIZES, index=2, key=f"{key}_page_size")
+    pages = page_count(len(rows), page_size)
+    page = int(c2.number_input("Faqja", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page"))
+    c3.caption(f"Faqja {page} nga {pages} · {len(rows):,} rreshta gjithsej")
+    with stage("tabela[faqja]", len(rows)) as rec:
+        page_df = page_rows(data, rows, page, page_size)
+        rec["rows_out"] = len(page_df)
+    st.dataframe(page_df, use_container_width=True)
+
+    fmt = st.radio("Formati i shkarkimit", list(FORMATS), horizontal=True, key=f"{key}_format")
+    ext, mime = FORMATS[fmt]
+    if export is None:
+        label, export = "📥 Shkarko të dhënat", lambda fmt: export_file(data, rows, fmt)
+    else:
+        label = "📥 Shkarko të gjitha rreshtat e filtruar (lexim i ri nga skedari)"
+    st.download_button(
+        label,
+        data=lambda: export(fmt),
+        file_name=f"te_dhena_filtruara.{ext}",
+        mime=mime,
+        on_click="ignore",
+    )
+
+chart_bytes = {}
+
+def show_chart(chart, data, name, target=st):
+    # Regjistron sa të dhëna i dërgohen shfletuesit për çdo grafik.
+    chart_bytes[name] = (len(data), payload_bytes(data))
+    with stage(f"altair[{name}]", len(data)):
+        target.altair_chart(chart, use_container_width=True)
+
+def show_perf():
+    # Plotëson panelin e matjeve me fazat e kësaj rinisjeje.
+    prof.stop()
+    table = pd.DataFrame(prof.rows(), columns=["faza", "thirrje", "s", "rows_in", "rows_out", "peak_mb", "rss_mb"])
+    table["s"] *= 1000
+    table = table.rename(columns={
+        "s": "koha (ms)", "rows_in": "rreshta hyrës", "rows_out": "rreshta dalës",
+        "peak_mb": "memoria max (MB)", "rss_mb": "RSS max (MB)",
+    })
+    cs = RESULTS.stats()
+    with perf:
+        st.caption(f"Rinisja e fundit: {prof.total_s * 1000:,.0f} ms")
+        if prof.memory_shared:
+            st.caption("⚠️ Një sesion tjetër po maste memorien njëkohësisht; "
+                       "memoria max e fazave të mbivendosura nuk shfaqet.")
+        st.caption(
+            f"🧠 Cache i përbashkët: {cs['hits']:,} goditje, {cs['misses']:,} mungesa"
+            + (f" ({cs['hit_rate']:.0%})" if cs["hit_rate"] is not None else "")
+            + f"; {cs['entries']:,} hyrje, {cs['bytes'] / 1024 ** 2:,.1f} / {cs['max_bytes'] / 1024 ** 2:,.0f} MB"
+        )
+        st.dataframe(table, hide_index=True, use_container_width=True)
+        c1, c2 = st.columns(2)
+        c1.download_button("JSON", prof.to_json(), file_name="matjet.json", mime="application/json", on_click="ignore")
+        c2.download_button(
+            "Prometheus", prof.to_prometheus(), file_name="matjet.prom", mime="text/plain", on_click="ignore"
+        )
 
-muajt_shqip_map = {
-    1: "Janar", 2: "Shkurt", 3: "Mars", 4: "Prill", 5: "Maj", 6: "Qershor",
-    7: "Korrik", 8: "Gusht", 9: "Shtator", 10: "Tetor", 11: "Nëntor", 12: "Dhjetor"
+muajt_shqip_map = MUAJT_SHQIP_MAP
+STREAMING_BYTES = 512 * 1024 * 1024
+DETAIL_ROWS = 10_000
+HS_NIVELET = {
+    "kodi": "Kodi i plotë", "kapitulli": "Kapitulli (2)", "pozicioni": "Pozicioni (4)", "nenpozicioni": "Nënpozicioni (6)",
 }
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Burimi i të dhënave (uploader i fshehur)
 # ──────────────────────────────────────────────────────────────────────────────
 default_path = "te_dhena_doganore_simuluara.csv"
-with st.sidebar.expander("⚙️ Opsione avancuara", expanded=False):
+adv = st.sidebar.expander("⚙️ Opsione avancuara", expanded=False)
+with adv:
     st.markdown("**Ngarko CSV (opsionale)** nëse do të zëvendësosh skedarin default.")
     up = st.file_uploader("Zgjidh CSV", type=["csv"], key="uploader", help="Në mungesë, përdoret skedari lokal.")
     st.caption(f"📁 Skedari default: `{default_path}`")
-
-df = load_csv_robust(up if up is not None else default_path)
-if df.empty:
+    data_dir = st.text_input(
+        "📚 Dosja e të dhënave (katalog)", value=os.environ.get("DOGANORE_DATA_DIR", ""),
+        help="Një CSV për muaj ose vit. Ngarkohen vetëm skedarët e vitit të zgjedhur; ka përparësi ndaj skedarit default.",
+    )
+    incremental = st.checkbox(
+        "🔁 Përditësim inkremental (rreshta të shtuar)", value=False, disabled=up is not None,
+        help="Kur skedari zgjatet me rreshta të rinj (p.sh. muaji i ri), lexohen dhe agregohen vetëm ata; "
+             "skedarët e rishkruar lexohen sërish të plotë.",
+    ) and up is None
+    chart_max_rows = int(st.number_input(
+        "Kufiri i rreshtave për grafik", min_value=100, max_value=100_000, value=DEFAULT_MAX_ROWS, step=500,
+        help="Mbi këtë kufi, kategoritë më të vogla bashkohen te 'Të tjera' para se të dërgohen te shfletuesi.",
+    ))
+
+# Matja e fazave: koha, rreshtat dhe memoria për çdo rinisje (panel i fshehur).
+perf = st.sidebar.expander("⏱️ Matja e performancës", expanded=False)
+trace_memory = perf.checkbox(
+    "Mat memorien maksimale për fazë", value=False,
+    help="Përdor tracemalloc, që është i përbashkët për gjithë procesin: sa kohë që një sesion mat memorien, "
+         "ngadalësohen pak rinisjet e të gjitha sesioneve. Prandaj është e çaktivizuar si parazgjedhje. "
+         "Kur dy sesione matin njëkohësisht, maksimumi nuk dallohet mes tyre dhe fazat e mbivendosura "
+         "mbeten pa vlerë.",
+)
+prof = Profiler(memory=trace_memory).start()
+
+catalog = None
+files = discover(data_dir) if up is None and data_dir and os.path.isdir(data_dir) else []
+if files:
+    stamps = tuple(source_stamp(f) for f in files)
+    with stage("katalogu", len(files)):
+        catalog = load_catalog(data_dir, tuple(zip(files, stamps)), incremental)
+    for path, err in catalog.errors:
+        st.error(f"❌ Skedari `{os.path.basename(path)}` nuk u lexua dhe u anashkalua. {err}")
+    src_size = max(stamp[0] for stamp in stamps)
+else:
+    src = up if up is not None else default_path
+    try:
+        src_stamp = source_stamp(src)
+        src_size = up.size if up is not None else src_stamp[0]
+    except FileNotFoundError:
+        src_stamp, src_size = None, 0
+streaming = adv.checkbox(
+    "🌊 Lexim me copa (për skedarë shumë të mëdhenj)", value=src_size >= STREAMING_BYTES,
+    help="Ruhen vetëm totalet e agreguara; rreshtat e tabelës lexohen nga skedari kur kërkohen.",
+)
+if catalog is not None:
+    # Viti zgjidhet nga statistikat e katalogut, para ngarkimit, që të lexohen vetëm particionet e tij.
+    st.sidebar.header("🔍 Filtrim")
+    vite_unq = catalog.values("vit")
+    vit = st.sidebar.selectbox("Zgjidh vitin", vite_unq) if len(vite_unq) else None
+    src = tuple(catalog.select(vit=vit))
+    src_stamp = tuple(source_stamp(path) for path in src)
+    adv.caption(f"📚 Katalogu: {len(catalog.partitions)} skedarë, {catalog.rows:,} rreshta; "
+                f"për vitin {vit} ngarkohen {len(src)}.")
+
+try:
+    with stage("ngarkimi") as rec:
+        if catalog is not None:
+            df, cube, load_info = load_partitions(src, src_stamp, streaming, incremental)
+        elif streaming:
+            df, cube, load_info = load_dataset_streaming(src, src_stamp, incremental)
+        else:
+            df, cube, load_info = load_dataset(src, src_stamp, incremental)
+        rec["rows_out"] = len(cube)
+except FileNotFoundError:
+    df, cube, load_info = None, pd.DataFrame(), {}
+if load_info.get("delta_rows"):
+    adv.caption(f"🔁 U shtuan {load_info['delta_rows']:,} rreshta të rinj te agregatet e ruajtura.")
+elif load_info.get("cache"):
+    adv.caption("⚡ Të dhënat u lexuan nga cache-i në disk.")
+elif load_info.get("encoding"):
+    adv.caption(
+        f"🔤 Encoding: `{load_info['encoding']}` (zbuluar në {load_info['sniff_s'] * 1000:.1f} ms, "
+        f"lexuar në {load_info['read_s']:.2f} s)"
+    )
+    if "chunks" in load_info:
+        adv.caption(f"🌊 {load_info['rows']:,} rreshta në {load_info['chunks']} copa → {len(cube):,} grupe.")
+if cube.empty:
     st.info("Ngarko një CSV nga Sidebar → ⚙️ Opsione avancuara, ose sigurohu që skedari default ekziston.")
+    show_perf()
     st.stop()
 
-# ──────────────────────────────────────────────────────────────────────────────
-# Normalizim kolonash
-# ──────────────────────────────────────────────────────────────────────────────
-df = df.rename(columns=lambda x: str(x).strip())
-aliases = {
-    "Vlera": ["Vlera (lekë)", "Vlera (€)", "Value", "Vlere", "Amount", "Value (€)"],
-    "Sasia (kg)": ["Sasia", "Sasi", "Quantity", "Sasia (kg)"],
-    "Muaji": ["Muaji", "Month", "Muaj"],
-    "Viti": ["Viti", "Year"],
-    "Lloji": ["Lloji", "Type", "Tipi", "Import/Eksport"],
-    "Kategoria": ["Kategoria", "Kategori", "Category"],
-}
-for canon, alts in aliases.items():
-    for a in alts:
-        if a in df.columns:
-            if canon != a:
-                df[canon] = df[a]
-            break
-
 # HS column detection
-possible_hs = [
-    "Kodi doganor", "Kodi_doganor", "KodiDoganor", "Kodi HS", "HS Code", "HS_Code", "HS",
-    "Kodi", "Kodi i mallrave", "HS6", "HS8", "Nomenklatura"
-]
-hs_col_found = None
-for c in df.columns:
-    if str(c).strip() in possible_hs:
-        hs_col_found = c
-        break
-
-# Pastrim numerik
-if "Vlera" in df.columns: df["Vlera"] = df["Vlera"].map(coerce_number)
-if "Sasia (kg)" in df.columns: df["Sasia (kg)"] = df["Sasia (kg)"].map(coerce_number)
-
-# Muajt në shqip
-if "Muaji" in df.columns:
-    mtmp = pd.to_numeric(df["Muaji"], errors="coerce")
-    df["Muaji"] = mtmp.map(muajt_shqip_map).fillna(df["Muaji"].astype(str).str.strip())
-    df["Muaji"] = df["Muaji"].replace({"": "Pa të dhëna"})
+hs_col_found = detect_hs_col(cube)
+with stage("indekset"):
+    cube_index, row_index, hs_index = load_filter_indexes(df, cube, (src, src_stamp, streaming))
+    rollup = load_rollup(cube, (src, src_stamp, streaming))
+
+# Rezultatet e filtrave ndahen mes sesioneve; kombinimet e zakonshme llogariten në sfond.
+dataset_key = (getattr(src, "file_id", src), src_stamp, streaming, incremental)
+WARMER.warm(dataset_key, engine.warm_filters(cube_index),
+            lambda **f: engine.filter_views(cube, cube_index, df, row_index, hs_index, **f))
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Sidebar – Filtrim (me Kategori)
 # ──────────────────────────────────────────────────────────────────────────────
-st.sidebar.header("🔍 Filtrim")
+# Me katalog, opsionet vijnë nga të gjitha particionet, jo vetëm nga viti i ngarkuar.
+options = catalog if catalog is not None else cube_index
+if catalog is None:
+    st.sidebar.header("🔍 Filtrim")
 
-vit = None
-if "Viti" in df.columns and df["Viti"].notna().any():
-    vite_unq = sorted(pd.to_numeric(df["Viti"], errors="coerce").dropna().unique())
+    # Vitet vijnë nga indeksi (pa NaN), jo nga një skanim i kubit.
+    vite_unq = sorted(cube_index.values("vit"))
     vit = st.sidebar.selectbox("Zgjidh vitin", vite_unq) if len(vite_unq) else None
 
-if "Lloji" in df.columns:
-    lloji = st.sidebar.selectbox("Zgjidh llojin", sorted(df["Lloji"].dropna().unique()))
+if "Lloji" in cube.columns:
+    lloji = st.sidebar.selectbox("Zgjidh llojin", sorted(options.values("lloji")))
 else:
     lloji = st.sidebar.selectbox("Zgjidh llojin", ["Import", "Eksport"])
 
 # Kategoria (multiselect) me 4 default
-if "Kategoria" in df.columns:
-    kategorite = sorted(df["Kategoria"].dropna().unique().tolist())
+if "Kategoria" in cube.columns:
+    kategorite = sorted(options.values("kategoria"))
     default_kategori = kategorite[:4] if len(kategorite) >= 4 else kategorite
     kategoria = st.sidebar.multiselect(
         "Zgjidh kategoritë",
@@ -127,87 +293,82 @@ else:
 hs_col = None
 if hs_col_found is not None:
     hs_col = st.sidebar.selectbox("Kolona e kodit doganor (HS)", [hs_col_found])
-    hs_values = df[hs_col].dropna().astype(str).unique().tolist()
-    hs_pick = st.sidebar.multiselect("Filtro sipas HS (opsionale)", options=hs_values, default=[])
+    # Typeahead: opsionet janë kodet me prefiksin e shkruar (sipas vlerës), jo të gjitha kodet.
+    hs_prefix = st.sidebar.text_input(
+        "Kërko HS sipas prefiksit", placeholder="p.sh. 39 ose 3926",
+        help="Kapitulli (2 shifra), pozicioni (4) ose nënpozicioni (6+).",
+    )
+    hs_picked = st.session_state.get("hs_pick", [])
+    hs_values = list(dict.fromkeys(hs_picked + hs_index.search(hs_prefix)))
+    hs_pick = st.sidebar.multiselect("Filtro sipas HS (opsionale)", options=hs_values, default=[], key="hs_pick")
 else:
     hs_pick = []
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Zbatimi i filtrave (vetëm kategoritë e përzgjedhura)
 # ──────────────────────────────────────────────────────────────────────────────
-df_f = df.copy()
-if vit is not None and "Viti" in df_f.columns:
-    df_f = df_f[pd.to_numeric(df_f["Viti"], errors="coerce") == vit]
-if "Lloji" in df_f.columns:
-    df_f = df_f[df_f["Lloji"] == lloji]
-if kategoria and "Kategoria" in df_f.columns:
-    df_f = df_f[df_f["Kategoria"].isin(kategoria)]
-if hs_pick and hs_col:
-    df_f = df_f[df_f[hs_col].astype(str).isin(hs_pick)]
-
-if df_f.empty:
+# KPI-të dhe grafikët presin kubin; rreshtat filtrohen vetëm për tabelën.
+filters = dict(vit=vit, lloji=lloji, kategoria=kategoria, hs_col=hs_col, hs_pick=hs_pick)
+fkey = filter_key(**filters)
+
+def shared(name, compute):
+    # Rezultat i përbashkët (read-only) për këtë dataset dhe gjendje filtrash.
+    return RESULTS.get_or_compute((dataset_key, name, fkey), compute)
+
+with stage("filtrat", len(cube)) as rec:
+    cube_f = shared("cube_f", lambda: cube_index.apply(cube, **filters))
+    rec["rows_out"] = len(cube_f)
+
+if cube_f.empty:
     st.warning("⚠️ Nuk ka të dhëna për këtë filtër.")
+    show_perf()
     st.stop()
 
-for c in ["Vlera", "Sasia (kg)"]:
-    if c in df_f.columns:
-        df_f[c] = pd.to_numeric(df_f[c], errors="coerce").fillna(0)
-
 # ──────────────────────────────────────────────────────────────────────────────
 # KPI-të: Import/Eksport + Mesatarja vjetore + Nr. transaksioneve në vit
 # ──────────────────────────────────────────────────────────────────────────────
 st.subheader("🔎 Përmbledhje")
 
-if "Lloji" in df_f.columns:
-    df_exp = df_f[df_f["Lloji"] == "Eksport"].copy()
-    df_imp = df_f[df_f["Lloji"] == "Import"].copy()
-else:
-    df_exp, df_imp = pd.DataFrame(), pd.DataFrame()
+with stage("kpi", len(cube_f)):
+    kpi = shared("kpi", lambda: engine.kpis(cube_f, vit))
+
+def fmt_kpi(value):
+    return f"{value:,.0f}" if value is not None else "—"
 
 k1, k2, k3, k4 = st.columns(4)
 with k1:
-    st.metric("Totali i eksporteve (lekë)",
-              f"{df_exp['Vlera'].sum():,.0f}" if "Vlera" in df_exp.columns else "—")
+    st.metric("Totali i eksporteve (lekë)", fmt_kpi(kpi["eksport_vlera"]))
 with k2:
-    st.metric("Totali i eksporteve (kg)",
-              f"{df_exp['Sasia (kg)'].sum():,.0f}" if "Sasia (kg)" in df_exp.columns else "—")
+    st.metric("Totali i eksporteve (kg)", fmt_kpi(kpi["eksport_sasia_kg"]))
 with k3:
-    st.metric("Totali i importeve (lekë)",
-              f"{df_imp['Vlera'].sum():,.0f}" if "Vlera" in df_imp.columns else "—")
+    st.metric("Totali i importeve (lekë)", fmt_kpi(kpi["import_vlera"]))
 with k4:
-    st.metric("Totali i importeve (kg)",
-              f"{df_imp['Sasia (kg)'].sum():,.0f}" if "Sasia (kg)" in df_imp.columns else "—")
+    st.metric("Totali i importeve (kg)", fmt_kpi(kpi["import_sasia_kg"]))
 
 k5, k6 = st.columns(2)
 with k5:
-    if vit is not None and "Vlera" in df_f.columns and "Viti" in df_f.columns:
-        avg_year = df_f.groupby("Viti")["Vlera"].mean().get(vit, np.nan)
-        st.metric("Mesatarja vjetore (lekë)",
-                  f"{avg_year:,.0f}" if not pd.isna(avg_year) else "—")
-    else:
-        st.metric("Mesatarja vjetore (lekë)", "—")
-
+    st.metric("Mesatarja vjetore (lekë)", fmt_kpi(kpi["mesatarja_vjetore"]))
 with k6:
-    if vit is not None and "Viti" in df_f.columns:
-        n_trans = len(df_f[df_f["Viti"] == vit])
-        st.metric("Nr. transaksioneve në vit", f"{n_trans:,}")
-    else:
-        st.metric("Nr. transaksioneve në vit", "—")
+    st.metric("Nr. transaksioneve në vit", fmt_kpi(kpi["transaksione_ne_vit"]))
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 📈 Grafik mujor (LINE) — Vlera (lekë)
 # ──────────────────────────────────────────────────────────────────────────────
-if "Muaji" in df_f.columns and "Vlera" in df_f.columns:
+if "Muaji" in cube_f.columns and "Vlera" in cube_f.columns:
     st.subheader(f"📈 Dinamika mujore e {lloji.lower()}-eve për vitin {vit if vit else '(të zgjedhurin)'}")
-    muaj_order = [m for m in muajt_shqip_map.values() if m in df_f["Muaji"].unique()]
+    # Shfletuesi merr një pikë për (Muaji, Kategoria), jo rreshtat e filtruar.
+    with stage("groupby[mujore]", len(cube_f)) as rec:
+        series = cap_categories(shared("mujore", lambda: monthly_series(cube_f)), chart_max_rows)
+        rec["rows_out"] = len(series)
+    muaj_order = [m for m in muajt_shqip_map.values() if m in series["Muaji"].unique()]
 
-    color_enc = "Kategoria:N" if "Kategoria" in df_f.columns else alt.value("steelblue")
+    color_enc = "Kategoria:N" if "Kategoria" in series.columns else alt.value("steelblue")
     tooltips = []
-    if "Kategoria" in df_f.columns: tooltips.append("Kategoria")
+    if "Kategoria" in series.columns: tooltips.append("Kategoria")
     tooltips += ["Muaji", alt.Tooltip("Vlera:Q", title="Vlera (lekë)", format=",.0f")]
 
-    st.altair_chart(
-        alt.Chart(df_f)
+    show_chart(
+        alt.Chart(series)
         .mark_line(point=True)
         .encode(
             x=alt.X("Muaji:N", title="Muaji", sort=muaj_order),
@@ -216,24 +377,28 @@ if "Muaji" in df_f.columns and "Vlera" in df_f.columns:
             tooltip=tooltips,
         )
         .properties(height=420),
-        use_container_width=True
+        series, "Dinamika mujore",
     )
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 📊 Vlera (lekë) vjetore sipas kategorive – bar (për të gjitha vitet, por i filtruar me kategoritë e zgjedhura)
 # ──────────────────────────────────────────────────────────────────────────────
-if all(c in df.columns for c in ["Lloji", "Kategoria", "Viti"]) and "Vlera" in df.columns:
+# Me katalog, historiku vjen nga totalet vjetore të particioneve, pa i ngarkuar ato.
+totals = catalog.yearly_totals() if catalog is not None else rollup
+if all(c in totals.columns for c in ["Lloji", "Kategoria", "Viti"]) and "Vlera" in totals.columns:
     st.subheader("📊 Vlera (lekë) vjetore sipas kategorive")
-    for lloji_temp in sorted(df["Lloji"].dropna().unique()):
+    for lloji_temp in sorted(totals["Lloji"].dropna().unique()):
         st.markdown(f"#### {lloji_temp}")
-        df_v = df[df["Lloji"] == lloji_temp].copy()
-        if kategoria and "Kategoria" in df_v.columns:
-            df_v = df_v[df_v["Kategoria"].isin(kategoria)]
-        df_v["Vlera"] = pd.to_numeric(df_v["Vlera"], errors="coerce").fillna(0)
-        df_v_sum = df_v.groupby(["Kategoria", "Viti"], as_index=False)["Vlera"].sum()
+        with stage("groupby[vjetore]", len(totals)) as rec:
+            df_v = totals[totals["Lloji"] == lloji_temp]
+            if kategoria and "Kategoria" in df_v.columns:
+                df_v = df_v[df_v["Kategoria"].isin(kategoria)]
+            df_v_sum = df_v.groupby(["Kategoria", "Viti"], as_index=False, observed=True)["Vlera"].sum()
+            df_v_sum = cap_categories(df_v_sum, chart_max_rows)
+            rec["rows_out"] = len(df_v_sum)
 
         kategoria_order = (
-            df_v_sum.groupby("Kategoria")["Vlera"].sum().sort_values(ascending=False).index.tolist()
+            df_v_sum.groupby("Kategoria", observed=True)["Vlera"].sum().sort_values(ascending=False).index.tolist()
         )
         chart_bar = (
             alt.Chart(df_v_sum)
@@ -247,21 +412,23 @@ if all(c in df.columns for c in ["Lloji", "Kategoria", "Viti"]) and "Vlera" in d
             )
             .properties(height=420)
         )
-        st.altair_chart(chart_bar, use_container_width=True)
+        show_chart(chart_bar, df_v_sum, f"Vlera vjetore – {lloji_temp}")
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 📦 Import vs Eksport sipas kategorive për vitin e zgjedhur – bar
 # ──────────────────────────────────────────────────────────────────────────────
-if vit is not None and all(c in df.columns for c in ["Viti", "Lloji", "Kategoria"]) and "Vlera" in df.columns:
+if vit is not None and all(c in rollup.columns for c in ["Viti", "Lloji", "Kategoria"]) and "Vlera" in rollup.columns:
     st.subheader(f"📦 Import vs Eksport sipas kategorive për vitin {vit}")
-    df_year = df[pd.to_numeric(df["Viti"], errors="coerce") == vit].copy()
-    if kategoria and "Kategoria" in df_year.columns:
-        df_year = df_year[df_year["Kategoria"].isin(kategoria)]
-    df_year["Vlera"] = pd.to_numeric(df_year["Vlera"], errors="coerce").fillna(0)
-    df_year_sum = df_year.groupby(["Kategoria", "Lloji"], as_index=False)["Vlera"].sum()
+    with stage("groupby[import_vs_eksport]", len(rollup)) as rec:
+        df_year = rollup[rollup["Viti"] == vit]
+        if kategoria and "Kategoria" in df_year.columns:
+            df_year = df_year[df_year["Kategoria"].isin(kategoria)]
+        df_year_sum = df_year.groupby(["Kategoria", "Lloji"], as_index=False, observed=True)["Vlera"].sum()
+        df_year_sum = cap_categories(df_year_sum, chart_max_rows)
+        rec["rows_out"] = len(df_year_sum)
 
     kategoria_order_year = (
-        df_year_sum.groupby("Kategoria")["Vlera"].sum().sort_values(ascending=False).index.tolist()
+        df_year_sum.groupby("Kategoria", observed=True)["Vlera"].sum().sort_values(ascending=False).index.tolist()
     )
     chart_ie = (
         alt.Chart(df_year_sum)
@@ -275,20 +442,24 @@ if vit is not None and all(c in df.columns for c in ["Viti", "Lloji", "Kategoria
         )
         .properties(height=420)
     )
-    st.altair_chart(chart_ie, use_container_width=True)
+    show_chart(chart_ie, df_year_sum, "Import vs Eksport")
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 🥧 Pesha % sipas Kategorive (Import vs Eksport) – bazuar në VLERË për vitin e zgjedhur
 # ──────────────────────────────────────────────────────────────────────────────
 st.subheader("🥧 Pesha % sipas Kategorive (Import vs Eksport, bazë vjetore)")
-if all(col in df.columns for col in ["Viti", "Lloji", "Kategoria", "Vlera"]) and vit is not None:
-    df_year_cat = df[pd.to_numeric(df["Viti"], errors="coerce") == vit].copy()
-    if kategoria and "Kategoria" in df_year_cat.columns:
-        df_year_cat = df_year_cat[df_year_cat["Kategoria"].isin(kategoria)]
-    df_year_cat["Vlera"] = pd.to_numeric(df_year_cat["Vlera"], errors="coerce").fillna(0)
-    df_year_cat["Kategoria"] = df_year_cat["Kategoria"].astype(str).str.strip().replace({"": "Pa kategori"})
+if all(col in rollup.columns for col in ["Viti", "Lloji", "Kategoria", "Vlera"]) and vit is not None:
+    with stage("groupby[pesha]", len(rollup)) as rec:
+        df_year_cat = rollup[rollup["Viti"] == vit]
+        if kategoria and "Kategoria" in df_year_cat.columns:
+            df_year_cat = df_year_cat[df_year_cat["Kategoria"].isin(kategoria)]
+        df_year_cat = df_year_cat.assign(
+            Kategoria=df_year_cat["Kategoria"].astype(str).str.strip().replace({"": "Pa kategori"})
+        )
 
-    agg_cat = df_year_cat.groupby(["Kategoria", "Lloji"], as_index=False)["Vlera"].sum()
+        agg_cat = df_year_cat.groupby(["Kategoria", "Lloji"], as_index=False, observed=True)["Vlera"].sum()
+        agg_cat = cap_categories(agg_cat, chart_max_rows)
+        rec["rows_out"] = len(agg_cat)
 
     def add_percent(df_lloji):
         total = df_lloji["Vlera"].sum()
@@ -318,7 +489,7 @@ if all(col in df.columns for col in ["Viti", "Lloji", "Kategoria", "Vlera"]) and
             )
             .properties(title=f"Import – {vit} (bazuar në VLERË)", width=420, height=420)
         )
-        c1.altair_chart(pie_imp, use_container_width=True)
+        show_chart(pie_imp, imp, "Pesha % – Import", target=c1)
     else:
         c1.info(f"Nuk ka të dhëna për Import në {vit}.")
 
@@ -337,7 +508,7 @@ if all(col in df.columns for col in ["Viti", "Lloji", "Kategoria", "Vlera"]) and
             )
             .properties(title=f"Eksport – {vit} (bazuar në VLERË)", width=420, height=420)
         )
-        c2.altair_chart(pie_eks, use_container_width=True)
+        show_chart(pie_eks, eksp, "Pesha % – Eksport", target=c2)
     else:
         c2.info(f"Nuk ka të dhëna për Eksport në {vit}.")
 else:
@@ -346,10 +517,16 @@ else:
 # ──────────────────────────────────────────────────────────────────────────────
 # 🔢 Top HS sipas VLERËS (lekë)
 # ──────────────────────────────────────────────────────────────────────────────
-if hs_col and "Vlera" in df_f.columns:
+if hs_col and "Vlera" in cube_f.columns:
     st.subheader("🔢 Top 15 HS sipas Vlera (lekë)")
-    df_hs = df_f.dropna(subset=[hs_col]).copy()
-    grp = df_hs.groupby(hs_col, as_index=False)["Vlera"].sum().sort_values("Vlera", ascending=False).head(15)
+    hs_niveli = st.radio(
+        "Niveli HS", list(HS_NIVELET), format_func=HS_NIVELET.get, horizontal=True, key="hs_niveli",
+    )
+    with stage("groupby[top_hs]", len(cube_f)) as rec:
+        # Roll-up nga indeksi HS; kubi ka RangeIndex, ndaj indeksi i prerjes janë pozicionet e saj.
+        grp = shared(f"top_hs[{hs_niveli}]", lambda: hs_index.top(cube_f.index.to_numpy(), hs_niveli, engine.TOP_HS))
+        grp = grp[[hs_col, "Vlera"]]
+        rec["rows_out"] = len(grp)
     hs_chart = (
         alt.Chart(grp)
         .mark_bar()
@@ -360,17 +537,31 @@ if hs_col and "Vlera" in df_f.columns:
         )
         .properties(height=520)
     )
-    st.altair_chart(hs_chart, use_container_width=True)
+    show_chart(hs_chart, grp, "Top 15 HS")
+
+if chart_bytes:
+    adv.markdown("**📦 Të dhënat e dërguara te grafikët**\n" + "\n".join(
+        f"- {name}: {rows:,} rreshta, {size / 1024:,.1f} KB" for name, (rows, size) in chart_bytes.items()
+    ))
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Tabela & Shkarkim (vetëm kategoritë e përzgjedhura)
 # ──────────────────────────────────────────────────────────────────────────────
 st.subheader("📋 Tabela e të dhënave")
-st.dataframe(df_f, use_container_width=True)
+if streaming:
+    # Në mënyrën me copa rreshtat nuk janë në memorie; lexohen vetëm me kërkesë.
+    if st.checkbox(f"Shfaq rreshtat e filtruar (deri në {DETAIL_ROWS:,}, lexim i ri nga skedari)"):
+        with stage("lexim[rreshta]") as rec:
+            df_rows = load_detail_rows(src, src_stamp, DETAIL_ROWS, **filters)
+            rec["rows_out"] = len(df_rows)
+        # Tabela shfaq deri në DETAIL_ROWS, por shkarkimi rilexon skedarin për të gjitha rreshtat e filtruar.
+        sources = src if isinstance(src, tuple) else (src,)
+        show_table(df_rows, np.arange(len(df_rows)), key="detail",
+                   export=lambda fmt: export_rows(sources, fmt, **filters))
+else:
+    with stage("filtrat[rreshta]", len(df)) as rec:
+        rows = shared("rreshta", lambda: row_index.positions(df, **filters))
+        rec["rows_out"] = len(rows)
+    show_table(df, rows, key="rows")
 
-st.download_button(
-    "📥 Shkarko të dhënat në CSV",
-    data=df_f.to_csv(index=False),
-    file_name="te_dhena_filtruara.csv",
-    mime="text/csv"
-)
+show_perf()
@@ -0,0 +1,29 @@
+"""Katalogu: një skedar që nuk lexohet anashkalohet, pa rrëzuar particionet e tjera."""
+from doganore import engine
+from doganore.catalog import Catalog, discover
+
+CSV = "Viti,Muaji,Kodi NK,Kategoria,Lloji,Vlera\n{vit},1,8471,Drithera,Import,10\n"
+
+
+def _catalog(tmp_path):
+    return Catalog.for_dir(tmp_path, lambda p: engine.load(p, streaming=True, use_cache=False)[1], cache_dir=tmp_path)
+
+
+def test_skedari_bosh_anashkalohet(tmp_path):
+    (tmp_path / "2023.csv").write_text(CSV.format(vit=2023), encoding="utf-8")
+    (tmp_path / "2024.csv").write_text(CSV.format(vit=2024), encoding="utf-8")
+    (tmp_path / "zz-bosh.csv").write_bytes(b"")
+
+    catalog = _catalog(tmp_path)
+    assert [p for p, _ in catalog.errors] == [str(tmp_path / "zz-bosh.csv")]
+    assert "EmptyDataError" in catalog.errors[0][1]
+    assert catalog.values("vit") == [2023, 2024]
+    assert catalog.select(vit=None) == discover(tmp_path)[:2]
+    assert catalog.rows == 2
+
+    # Gabimi ruhet në manifest; skedari lexohet sërish vetëm kur ndryshon.
+    assert len(_catalog(tmp_path).errors) == 1
+    (tmp_path / "zz-bosh.csv").write_text(CSV.format(vit=2025), encoding="utf-8")
+    catalog = _catalog(tmp_path)
+    assert catalog.errors == []
+    assert catalog.values("vit") == [2023, 2024, 2025]
@@ -0,0 +1,34 @@
+"""CLI: gabimet e hyrjes japin një mesazh të vetëm dhe kod daljeje, jo traceback."""
+import json
+
+import pytest
+
+from doganore.cli import main
+
+CSV = "Viti,Lloji,Kategoria,Kodi NK,Vlera\n2023,Import,A,8471,10\n2024,Import,A,8471,20\n2024,Eksport,B,0813,5\n"
+
+
+@pytest.mark.parametrize("content", [b"", b"Viti,Vlera\n2024,1\n2024,1,2,3\n"], ids=["bosh", "e-keqformuar"])
+def test_csv_e_pavlefshme(tmp_path, capsys, content):
+    path = tmp_path / "x.csv"
+    path.write_bytes(content)
+    assert main([str(path), "--no-cache"]) == 1
+    err = capsys.readouterr().err
+    assert err.startswith("CSV-ja nuk u lexua") and len(err.strip().splitlines()) == 1
+
+
+def test_viti_jo_numer(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main([str(tmp_path / "x.csv"), "--viti", "abc"])
+    assert exc.value.code == 2
+    assert "viti duhet të jetë numër" in capsys.readouterr().err
+
+
+def test_viti_numer_dhe_all(tmp_path, capsys):
+    path = tmp_path / "x.csv"
+    path.write_text(CSV, encoding="utf-8")
+    assert main([str(path), "--no-cache", "--viti", "2024", "--lloji", "Import"]) == 0
+    [rep] = json.loads(capsys.readouterr().out)
+    assert rep["filtrat"]["viti"] == 2024 and rep["kpi"]["import_vlera"] == 20
+    assert main([str(path), "--no-cache", "--viti", "all", "--lloji", "all"]) == 0
+    assert len(json.loads(capsys.readouterr().out)) == 4
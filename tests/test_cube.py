@@ -0,0 +1,48 @@
+"""`yearly_rollup`: grafikët vjetorë nga roll-up-i japin të njëjtat shuma si nga kubi."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from doganore.cube import build_cube, yearly_rollup
+
+
+@pytest.fixture(scope="module")
+def cube():
+    rng = np.random.default_rng(0)
+    n = 5_000
+    df = pd.DataFrame({
+        "Viti": rng.integers(2020, 2024, n).astype(float),
+        "Muaji": rng.choice(["Janar", "Shkurt"], n),
+        "Lloji": rng.choice(["Import", "Eksport"], n),
+        "Kategoria": rng.choice(["A", "B", "C", ""], n),
+        "Kodi NK": rng.integers(1000, 1300, n).astype(str),
+        "Vlera": rng.uniform(0, 100, n),
+        "Sasia (kg)": rng.uniform(0, 10, n),
+    })
+    for col in ["Viti", "Lloji", "Kategoria"]:
+        df.loc[rng.random(n) < 0.03, col] = np.nan
+    return build_cube(df, "Kodi NK")
+
+
+def _sums(frame, vit, keys):
+    part = frame[frame["Viti"] == vit] if vit is not None else frame
+    part = part.assign(Kategoria=part["Kategoria"].astype(str))
+    sums = part.groupby(keys, as_index=False, observed=True)[["Vlera", "Sasia (kg)", "_rreshta"]].sum()
+    return sums.sort_values(keys).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("vit, keys", [
+    (None, ["Kategoria", "Viti"]),
+    (2021.0, ["Kategoria", "Lloji"]),
+])
+def test_rollup_si_kubi(cube, vit, keys):
+    rollup = yearly_rollup(cube)
+    assert len(rollup) < len(cube)
+    got, expected = _sums(rollup, vit, keys), _sums(cube, vit, keys)
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+
+def test_rollup_ruan_nan(cube):
+    rollup = yearly_rollup(cube)
+    assert rollup["_rreshta"].sum() == cube["_rreshta"].sum()
+    assert rollup["Kategoria"].isna().any() and rollup["Lloji"].isna().any()
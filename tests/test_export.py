@@ -0,0 +1,51 @@
+"""Eksporti në mënyrën me copa: të gjitha rreshtat e filtruar, jo vetëm ato të tabelës."""
+import io
+
+import pandas as pd
+import pytest
+
+from doganore.export import export_file, fill_measures
+from doganore.filters import apply_filters
+from doganore.loader import read_csv_sniffed
+from doganore.normalize import normalize_frame
+from doganore.streaming import export_rows
+
+FILTERS = dict(vit=2024, lloji="Import", kategoria=["A", "B"])
+
+
+def _csv(path, years, n=3_000, tail=b""):
+    rows = [f"{years[i % len(years)]},{'Import' if i % 3 else 'Eksport'},{'ABC'[i % 3]},{i},{i}.5"
+            for i in range(n)]
+    path.write_bytes(("Viti,Lloji,Kategoria,Kodi NK,Vlera\n" + "\n".join(rows) + "\n").encode("ascii") + tail)
+    return path
+
+
+def _expected(paths):
+    frames = [normalize_frame(read_csv_sniffed(p)[0]) for p in paths]
+    return fill_measures(apply_filters(pd.concat(frames, ignore_index=True), **FILTERS))
+
+
+@pytest.mark.parametrize("fmt, read", [
+    ("CSV", lambda f: pd.read_csv(f, dtype={"Kodi NK": str})),
+    ("CSV (gzip)", lambda f: pd.read_csv(f, compression="gzip", dtype={"Kodi NK": str})),
+    ("Parquet", pd.read_parquet),
+])
+def test_eksporti_me_copa_perfshin_te_gjitha_rreshtat(tmp_path, fmt, read):
+    paths = [_csv(tmp_path / "a.csv", [2023, 2024]), _csv(tmp_path / "b.csv", [2024])]
+    out = read(io.BytesIO(export_rows(paths, fmt, chunksize=500, **FILTERS).read()))
+    expected = _expected(paths)
+    assert len(expected) > 1_000
+    assert out["Vlera"].tolist() == pytest.approx(expected["Vlera"].tolist())
+    assert out["Kodi NK"].tolist() == expected["Kodi NK"].tolist()
+
+
+def test_eksporti_rinis_me_cp1252(tmp_path):
+    path = _csv(tmp_path / "euro.csv", [2024], n=10_000, tail='2024,Import,A,1,"€ 1.234,56"\n'.encode("cp1252"))
+    out = pd.read_csv(export_rows([path], "CSV", chunksize=2_000, **FILTERS))
+    assert out["Vlera"].iloc[-1] == pytest.approx(1234.56)
+    assert len(out) == len(_expected([path]))
+
+
+def test_eksporti_pa_rreshta_mban_koken(tmp_path):
+    df = pd.DataFrame({"Viti": [2024], "Vlera": [1.0]})
+    assert export_file(df, [], "CSV").read() == b"Viti,Vlera\n"
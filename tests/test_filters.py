@@ -0,0 +1,78 @@
+"""`FilterIndex` kthen të njëjtët rreshta, në të njëjtën renditje, si `apply_filters`."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from doganore.filters import FilterIndex, apply_filters
+
+KATEGORI = [f"Kategoria {i:02d}" for i in range(30)]
+
+
+def make_frame(n=20_000, n_hs=300, seed=0):
+    rng = np.random.default_rng(seed)
+    hs = rng.choice(np.arange(1_000, 9_999), n_hs, replace=False).astype(str)
+    df = pd.DataFrame({
+        "Viti": rng.integers(2015, 2026, n).astype(float),
+        "Kodi HS": hs[rng.integers(0, n_hs, n)],
+        "Kodi NK": rng.integers(10, 99, n).astype(str),
+        "Kategoria": rng.choice(KATEGORI, n),
+        "Lloji": rng.choice(["Import", "Eksport"], n),
+    })
+    # NaN në çdo kolonë filtri: nuk kalojnë asnjë filtër, por mbeten kur kolona s'filtrohet.
+    for col in ["Viti", "Kodi HS", "Kategoria", "Lloji"]:
+        df.loc[rng.random(n) < 0.02, col] = np.nan
+    df["Kategoria"] = df["Kategoria"].astype("category")
+    return df
+
+
+DF = make_frame()
+HS = DF["Kodi HS"].dropna().unique().tolist()
+
+SCENARIOS = {
+    "pa filtra": dict(),
+    "vit": dict(vit=2020),
+    "vit+lloji+kat": dict(vit=2020, lloji="Import", kategoria=KATEGORI[:4]),
+    "+ HS": dict(vit=2020, lloji="Import", kategoria=KATEGORI[:4], hs_col="Kodi HS", hs_pick=HS[:5]),
+    "vetëm HS": dict(hs_col="Kodi HS", hs_pick=HS[:1]),
+    "vit i panjohur": dict(vit=1999),
+    "kategori e panjohur": dict(kategoria=["S'ekziston"]),
+    "kategori e përzier": dict(kategoria=["S'ekziston", KATEGORI[3]]),
+    "HS e panjohur": dict(hs_col="Kodi HS", hs_pick=["0000", HS[2]]),
+    "hs_pick pa hs_col": dict(vit=2021, hs_pick=HS[:3]),
+    "HS e paindeksuar": dict(lloji="Eksport", hs_col="Kodi NK", hs_pick=["42", "17"]),
+}
+
+
+@pytest.mark.parametrize("filters", SCENARIOS.values(), ids=SCENARIOS.keys())
+def test_indeksi_si_maska(filters):
+    expected = apply_filters(DF, **filters)
+    got = FilterIndex(DF, "Kodi HS").apply(DF, **filters)
+    assert got.index.equals(expected.index)
+
+
+def test_pa_kolone_hs_te_indeksuar():
+    filters = SCENARIOS["+ HS"]
+    got = FilterIndex(DF, None).apply(DF, **filters)
+    assert got.index.equals(apply_filters(DF, **filters).index)
+
+
+def test_vlerat_pa_nan():
+    index = FilterIndex(DF, "Kodi HS")
+    assert sorted(index.values("vit")) == list(range(2015, 2026))
+    assert set(index.values("kategoria")) == set(KATEGORI)
+
+
+def test_tipet_e_vogla():
+    index = FilterIndex(DF, "Kodi HS")
+    codes, _, order, _, _ = index._cols["lloji"]
+    assert codes.dtype == np.int8 and order.dtype == np.int32
+    assert index._cols["hs"][0].dtype == np.int16
+
+
+@pytest.mark.parametrize("n_kat", [127, 128])
+def test_kufiri_i_tipit_te_kodeve(n_kat):
+    # Kodi më i madh + 1 duhet të mbetet brenda tipit (int8 për 127 vlera, int16 për 128).
+    df = pd.DataFrame({"Viti": [2020.0] * n_kat * 2, "Kategoria": [f"K{i}" for i in range(n_kat)] * 2})
+    filters = dict(vit=2020, kategoria=[f"K{n_kat - 1}", "K0"])
+    got = FilterIndex(df).apply(df, **filters)
+    assert got.index.equals(apply_filters(df, **filters).index)
@@ -0,0 +1,60 @@
+"""Normalizimi i kodeve HS: i njëjti kod jep të njëjtin varg, si numër ose si tekst."""
+import io
+
+import pandas as pd
+import pytest
+
+from doganore.incremental import load_incremental
+from doganore.loader import read_csv_sniffed
+from doganore.normalize import normalize_frame, normalize_hs
+from doganore.streaming import iter_chunks
+
+CSV = "Viti,Kodi NK ,Lloji,Vlera\n2024,8471.30,Import,1\n2024,\"8471.30\",Import,2\n2024,813,Eksport,3\n2024,0813,Eksport,4\n"
+
+
+@pytest.mark.parametrize("values, expected", [
+    (["8471.30", "8471 30", 847130], ["847130"] * 3),
+    ([813, "813", "0813", 813.0], ["0813"] * 4),
+])
+def test_normalize_hs_numer_dhe_tekst(values, expected):
+    assert normalize_hs(pd.Series(values, dtype=object)).tolist() == expected
+
+
+def test_normalize_hs_mungesat():
+    out = normalize_hs(pd.Series([None, "", "abc", float("nan")], dtype=object))
+    assert out.isna().all()
+
+
+def _codes(df):
+    return normalize_frame(df)["Kodi NK"].tolist()
+
+
+def test_leximi_i_plote_dhe_me_copa_japin_te_njejtat_kode():
+    expected = ["847130", "847130", "0813", "0813"]
+    df, _ = read_csv_sniffed(io.BytesIO(CSV.encode()))
+    assert _codes(df) == expected
+    chunks = list(iter_chunks(io.BytesIO(CSV.encode()), "utf-8", chunksize=1))
+    assert [c for chunk in chunks for c in chunk["Kodi NK"]] == expected
+
+
+def test_delta_inkrementale_si_leximi_i_plote(tmp_path):
+    path = tmp_path / "d.csv"
+    head, *rows = CSV.splitlines(keepends=True)
+    path.write_text(head + rows[0] + rows[2])
+    load_incremental(str(path), cache_dir=tmp_path / "cache")
+    with open(path, "a") as fh:
+        fh.write(rows[1] + rows[3])
+    df, cube, info = load_incremental(str(path), cache_dir=tmp_path / "cache")
+    assert info["delta_rows"] == 2
+    assert sorted(df["Kodi NK"]) == ["0813", "0813", "847130", "847130"]
+    assert sorted(cube["Kodi NK"]) == ["0813", "847130"]
+
+
+def test_prefikset_e_perdoruesit_nuk_mbushen_me_zero():
+    from doganore.hs_index import HSIndex
+
+    cube = pd.DataFrame({"Kodi NK": ["0813", "3921", "3926", "392690"], "Vlera": [1.0, 2.0, 3.0, 4.0]})
+    index = HSIndex(cube, "Kodi NK")
+    assert index.expand(["392"]) == ["3921", "3926", "392690"]
+    assert sorted(index.expand(["3926"])) == sorted(index.search("3926")) == ["3926", "392690"]
+    assert index.expand(["39261"]) == index.search("39261") == []
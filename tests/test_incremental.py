@@ -0,0 +1,109 @@
+"""Ngarkimi inkremental: delta-t për skedarët e zgjatur, leximi i plotë për çdo mospërputhje."""
+import os
+
+import pytest
+
+from doganore import engine, incremental
+from doganore.incremental import load_incremental, read_state
+
+HEADER = "Viti,Lloji,Kategoria,Kodi NK,Vlera\n"
+
+
+def _rows(start, n, vit=2024):
+    lloji = ["Eksport", "Import"]
+    return "".join(f"{vit},{lloji[i % 2]},K{i % 3},{1000 + i % 7},{i}\n" for i in range(start, start + n))
+
+
+def _load(path, tmp_path, streaming=False):
+    return load_incremental(str(path), streaming, cache_dir=tmp_path / "cache")
+
+
+def _assert_as_full(path, df, cube):
+    full_df, full_cube, _ = engine.load_dataset(str(path), use_cache=False)
+    assert cube["_rreshta"].sum() == len(full_df)
+    assert cube["Vlera"].sum() == pytest.approx(full_cube["Vlera"].sum())
+    if df is not None:
+        assert sorted(df["Vlera"]) == sorted(full_df["Vlera"])
+
+
+@pytest.fixture
+def path(tmp_path):
+    p = tmp_path / "d.csv"
+    p.write_text(HEADER + _rows(0, 50))
+    return p
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_rreshtat_e_shtuar_lexohen_si_delta(tmp_path, path, streaming):
+    _, _, info = _load(path, tmp_path, streaming)
+    assert info["incremental"] is False
+    with open(path, "a") as fh:
+        fh.write(_rows(50, 20, vit=2025))
+    df, cube, info = _load(path, tmp_path, streaming)
+    assert info == {"incremental": True, "delta_rows": 20}
+    _assert_as_full(path, df, cube)
+    _, _, info = _load(path, tmp_path, streaming)
+    assert info["cache"] and info["delta_rows"] == 0
+
+
+def test_skedari_i_shkurtuar_lexohet_i_plote(tmp_path, path):
+    _load(path, tmp_path)
+    path.write_text(HEADER + _rows(0, 10))
+    df, cube, info = _load(path, tmp_path)
+    assert info["incremental"] is False and len(df) == 10
+    _assert_as_full(path, df, cube)
+
+
+def test_rishkrimi_me_te_njejten_madhesi_lexohet_i_plote(tmp_path, path):
+    _load(path, tmp_path)
+    mtime = os.stat(path).st_mtime_ns
+    path.write_text(HEADER + _rows(0, 50).replace("2024,", "2023,"))
+    os.utime(path, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+    df, cube, info = _load(path, tmp_path)
+    assert info["incremental"] is False
+    assert set(df["Viti"]) == {2023}
+
+
+def test_ndryshimi_para_kufirit_lexohet_i_plote(tmp_path, path):
+    _load(path, tmp_path)
+    path.write_text(HEADER + _rows(0, 50).replace("2024,", "2023,", 1) + _rows(50, 5))
+    df, cube, info = _load(path, tmp_path)
+    assert info["incremental"] is False
+    _assert_as_full(path, df, cube)
+
+
+def test_kufiri_jo_ne_fund_rreshti_lexohet_i_plote(tmp_path, path):
+    path.write_text(HEADER + _rows(0, 50).rstrip("\n"))
+    _load(path, tmp_path)
+    with open(path, "a") as fh:
+        fh.write("7\n" + _rows(50, 5))  # vazhdon rreshtin e fundit: Vlera 49 → 497
+    df, cube, info = _load(path, tmp_path)
+    assert info["incremental"] is False
+    assert 497 in set(df["Vlera"]) and 49 not in set(df["Vlera"])
+    _assert_as_full(path, df, cube)
+
+
+def test_gabim_dekodimi_ne_delta_lexohet_i_plote(tmp_path, path):
+    _load(path, tmp_path)
+    assert read_state(str(path), cache_dir=tmp_path / "cache")["encoding"] == "utf-8"
+    with open(path, "ab") as fh:
+        fh.write('2025,Import,K0,1000,"€ 1.234,56"\n'.encode("cp1252"))
+    df, cube, info = _load(path, tmp_path)
+    assert info["incremental"] is False and info["encoding"] == "cp1252"
+    assert df["Vlera"].max() == pytest.approx(1234.56)
+
+
+def test_segmentet_bashkohen_pas_kufirit(tmp_path, path, monkeypatch):
+    monkeypatch.setattr(incremental, "MAX_SEGMENTS", 2)
+    _load(path, tmp_path)
+    counts = []
+    for i in range(3):
+        with open(path, "a") as fh:
+            fh.write(_rows(50 + 10 * i, 10))
+        df, cube, info = _load(path, tmp_path)
+        assert info["delta_rows"] == 10
+        counts.append(len(read_state(str(path), cache_dir=tmp_path / "cache")["segments"]))
+    assert counts == [2, 1, 2]
+    _assert_as_full(path, df, cube)
+    df, cube, info = _load(path, tmp_path)
+    assert info["cache"] and len(df) == 80
@@ -0,0 +1,40 @@
+"""Encoding-u: një bajt jo-UTF-8 pas prefiksit provohet me cp1252 para latin1."""
+import pytest
+
+from doganore.loader import SNIFF_BYTES, read_csv_sniffed
+from doganore.normalize import normalize_frame
+from doganore.streaming import scan_rows, stream_aggregate
+
+HEADER = "Viti,Lloji,Vlera\n"
+ASCII_ROWS = "2024,Import,1\n" * 10_000
+
+
+def _write(path, tail):
+    data = (HEADER + ASCII_ROWS).encode("ascii") + tail
+    assert len(data) - len(tail) > SNIFF_BYTES
+    path.write_bytes(data)
+    return path
+
+
+def test_euro_pas_prefiksit_lexohet_si_cp1252(tmp_path):
+    path = _write(tmp_path / "euro.csv", '2024,Eksport,"€ 1.234,56"\n'.encode("cp1252"))
+
+    df, info = read_csv_sniffed(path)
+    assert info["encoding"] == "cp1252"
+    assert df["Vlera"].iloc[-1] == "€ 1.234,56"
+    assert normalize_frame(df)["Vlera"].iloc[-1] == pytest.approx(1234.56)
+
+    cube, info = stream_aggregate(path, chunksize=4_000)
+    assert info["encoding"] == "cp1252"
+    assert cube.loc[cube["Lloji"] == "Eksport", "Vlera"].sum() == pytest.approx(1234.56)
+
+    rows = scan_rows(path, lloji="Eksport", chunksize=4_000)
+    assert rows["Vlera"].tolist() == pytest.approx([1234.56])
+
+
+def test_bajte_jashte_cp1252_bien_te_latin1(tmp_path):
+    # 0x81 nuk ekziston në cp1252; vetëm latin1 e lexon.
+    path = _write(tmp_path / "latin1.csv", b"2024,Eksport,\x81 5\n")
+    df, info = read_csv_sniffed(path)
+    assert info["encoding"] == "latin1"
+    assert df["Vlera"].iloc[-1] == "\x81 5"
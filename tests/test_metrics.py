@@ -0,0 +1,61 @@
+"""`tracemalloc` ndahet mes profiler-ave: ndalet vetëm kur s'ka më asnjë që mat memorien."""
+import gc
+import tracemalloc
+
+import pytest
+
+from doganore.metrics import Profiler
+
+
+@pytest.fixture(autouse=True)
+def _pa_tracemalloc():
+    if tracemalloc.is_tracing():
+        pytest.skip("tracemalloc është nisur jashtë testit")
+    yield
+    tracemalloc.stop()
+
+
+def test_profiler_pa_memorie_nuk_ndal_matjen_e_tjetrit():
+    a = Profiler(memory=True).start()
+    with a.stage("e jashtme"):
+        b = Profiler(memory=False).start()
+        b.stop()
+        assert tracemalloc.is_tracing()
+        data = [bytearray(1024) for _ in range(2000)]
+    a.stop()
+    assert a.records["e jashtme"]["peak_mb"] > 1
+    assert not tracemalloc.is_tracing()
+    del data
+
+
+def test_ndalet_pas_profiler_it_te_fundit():
+    a = Profiler(memory=True).start()
+    b = Profiler(memory=True).start()
+    b.stop()
+    assert tracemalloc.is_tracing()
+    a.stop()
+    assert not tracemalloc.is_tracing()
+
+
+def test_profiler_i_braktisur_liron_matjen():
+    Profiler(memory=True).start()
+    gc.collect()
+    Profiler(memory=False).start().stop()
+    assert not tracemalloc.is_tracing()
+
+
+def test_maksimumi_i_perbashket_nuk_regjistrohet_kur_mbivendosen():
+    a = Profiler(memory=True).start()
+    with a.stage("e vetme"):
+        data = [bytearray(1024) for _ in range(2000)]
+    with a.stage("A"):
+        data = [bytearray(1024) for _ in range(2000)]
+        b = Profiler(memory=True).start()
+        with b.stage("B"):
+            pass  # `reset_peak` i B-së fshin maksimumin e A-së
+        b.stop()
+    a.stop()
+    assert a.records["e vetme"]["peak_mb"] > 1
+    assert a.records["A"]["peak_mb"] is None and a.memory_shared
+    assert b.records["B"]["peak_mb"] is None and b.memory_shared
+    del data
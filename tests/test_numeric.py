@@ -0,0 +1,63 @@
+"""`coerce_number_series` (kolonor) jep të njëjtin rezultat si `coerce_number` për qelizë."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.generate_data import dirty_column
+from doganore.numeric import coerce_number, coerce_number_series
+
+EDGE_CASES = [
+    "1234", "1234.5", "1,234.56", "1.234,56", "1.234.567,89", "12,5", "1,234,567",
+    "€ 1.234,56", "1 234 Lek", "1234 lekë", "1234 Lekë", "LEK 99", "\xa0 1.234,5 \xa0",
+    "-3,25", "1e3", "inf", "-Infinity", "nan", "NaN", "", "   ", "abc", "12abc",
+    "1_000", "0x10", "1.2.3", "1,2,3", "1,2.3", ".5", "5.", "+7", "€", "٣٤",
+    "\x1c12\x1f", "\u200b12", "\u300012\u3000", "\t12\n", "1.234,56\nLEK",
+    # Hapësirë para eksponentit: float() e refuzon, pd.to_numeric e pranon.
+    "5E 3", "5e\t3", "5 e3", "5E+ 3",
+    None, np.nan,
+]
+
+
+def assert_equivalent(ser):
+    expected = pd.to_numeric(ser.map(coerce_number), errors="coerce").to_numpy(dtype=np.float64)
+    got = coerce_number_series(ser).to_numpy(dtype=np.float64)
+    bad = ~((expected == got) | (np.isnan(expected) & np.isnan(got)))
+    assert not bad.any(), f"mospërputhje: {ser[bad].head(10).tolist()!r}"
+
+
+@pytest.mark.parametrize("value", EDGE_CASES)
+def test_rastet_kufitare(value):
+    assert_equivalent(pd.Series([value], dtype=object))
+
+
+def test_rastet_kufitare_bashke():
+    assert_equivalent(pd.Series(EDGE_CASES, dtype=object))
+
+
+def test_hapesira_ne_eksponent():
+    assert coerce_number_series(pd.Series(["5E 3", "5 e3"], dtype=object)).tolist()[0] == 5000.0
+    assert np.isnan(coerce_number_series(pd.Series(["5 e3"], dtype=object))[0])
+
+
+def test_kolone_e_perziere():
+    assert_equivalent(pd.Series([1, 2.5, "1.234,5", None], dtype=object))
+
+
+def test_kolone_e_piste():
+    assert_equivalent(dirty_column(20_000))
+
+
+def test_kolone_arrow_str():
+    assert_equivalent(pd.Series(["1.234,56", "€ 12", None, "5E 3"], dtype="str"))
+
+
+def test_kolone_numerike_kthehet_e_njejte():
+    ser = pd.Series([1.5, 2.0])
+    assert coerce_number_series(ser) is ser
+
+
+def test_fuzz():
+    rng = np.random.default_rng(1)
+    alphabet = list("0123456789.,eE +-\xa0\t_") + ["€", "Lek", "lekë", "LEK", "inf", "nan"]
+    cases = ["".join(rng.choice(alphabet, rng.integers(0, 9))) for _ in range(20_000)]
+    assert_equivalent(pd.Series(cases, dtype=object))